@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+arch_explorer.py
+----------------
+Automated design-space exploration over Block RAM architectures.
+
+Workflow:
+  * Enumerates (size_bits, max_width, lb_per_bram) ranges for one or more BRAM types,
+    optionally alongside LUTRAM (built with build_arch_multi_bram, which matches
+    build_arch_one_bram / build_arch_lutram_plus_bram / build_arch_custom_example).
+  * Computes a cheap lower bound on the geometric average area of every point
+    (no mapping needed) and evaluates points best-bound-first.
+  * Stops once no remaining bound can beat the current top-N, and reports how many
+    points were mapped, re-scored from a shared mapping, or pruned.
+
+Usage:
+    python3 arch_explorer.py --sizes 1024,2048,4096,8192,16384,32768 \\
+        --widths 16,32,64 --lbs 5,10,20,40 --lutram --top 5
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple
+
+from area_model import evaluate_area, ram_type_params, tile_area
+from ram_mapper_core import (OBJECTIVES, Architecture, IncrementalMapper, Items, arch_fingerprint,
+                             build_arch_multi_bram, item_column, load_inputs, run_mapper_batch)
+
+# One architecture point: ((size_bits, max_width, lb_per_bram) per BRAM type, with_lutram)
+DesignPoint = Tuple[Tuple[Tuple[int, int, int], ...], bool]
+
+
+def enumerate_points(sizes: List[int],
+                     widths: List[int],
+                     lbs: List[int],
+                     num_brams: int = 1,
+                     with_lutram: bool = True) -> List[DesignPoint]:
+    """
+    Lists every design point. With several BRAM types, sizes must strictly increase
+    with the type index so that permutations of the same types are not repeated.
+    """
+    per_type = [(s, w, r) for s in sizes for w in widths for r in lbs if w <= s]
+    points = []
+    for combo in itertools.product(per_type, repeat=num_brams):
+        if all(a[0] < b[0] for a, b in zip(combo, combo[1:])):
+            points.append((tuple(combo), with_lutram))
+    return points
+
+
+def circuit_profiles(items: Items, logic_block_counts: Dict[int, int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Returns Circuit ID -> (logic blocks, total logical RAM bits) for lower bounds.
+    """
+    bits: Dict[int, int] = {}
+    for circuit, depth, width in zip(item_column(items, "Circuit"),
+                                     item_column(items, "Depth"),
+                                     item_column(items, "Width")):
+        bits[circuit] = bits.get(circuit, 0) + depth * width
+    return {c: (logic_block_counts.get(c, 0), bits.get(c, 0))
+            for c in set(logic_block_counts) | set(bits)}
+
+
+def area_lower_bound(arch: List[dict], profiles: Dict[int, Tuple[int, int]]) -> float:
+    """
+    Lower bound on the geometric average area of arch, without mapping.
+
+    A circuit needs at least its logic blocks, and at least enough tiles to hold all
+    of its RAM bits in the memory that comes with each tile (waste, overhead LUTs and
+    mode restrictions can only increase this). Area is monotone in tiles.
+    """
+    bits_per_tile = 0.0
+    for ram in arch:
+        lutram, lb_per_bram, _ = ram_type_params(ram)
+        if lutram:
+            bits_per_tile += ram["capacity_bits"] / (1 + lb_per_bram)
+        else:
+            bits_per_tile += ram["capacity_bits"] / lb_per_bram
+
+    log_sum = 0.0
+    for logic_blocks, bits in profiles.values():
+        tiles = max(logic_blocks, math.ceil(bits / bits_per_tile) if bits_per_tile else 0, 1)
+        log_sum += math.log(tile_area(tiles, arch))
+    return math.exp(log_sum / len(profiles)) if profiles else 0.0
+
+
+def explore(items: Items,
+            logic_block_counts: Dict[int, int],
+            points: List[DesignPoint],
+            top_n: int = 5,
+            max_series: int = 16,
+            objective: str = "waste",
+            verbose: bool = True) -> dict:
+    """
+    Finds the top_n design points by geometric average area with branch-and-bound.
+
+    Returns a dict with:
+      best: [(geo_mean_area, DesignPoint)] sorted by area.
+      evaluated: Points whose area was computed exactly.
+      mapped: ... of which needed a new mapping (the rest reused one, because
+              with objective "waste" the mapping does not depend on lb_per_bram).
+      pruned: Points skipped because their lower bound could not reach the top_n.
+      total: Number of points.
+    """
+    profiles = circuit_profiles(items, logic_block_counts)
+    mapper = IncrementalMapper(items)
+    mappings: Dict[tuple, dict] = {}
+
+    queue = []
+    for idx, point in enumerate(points):
+        arch = Architecture(build_arch_multi_bram(list(point[0]), with_lutram=point[1]))
+        heapq.heappush(queue, (area_lower_bound(arch, profiles), idx, point, arch))
+
+    best: List[Tuple[float, int, DesignPoint]] = []  # max-heap via negated area
+    evaluated = mapped = 0
+
+    while queue:
+        bound, idx, point, arch = queue[0]
+        if len(best) == top_n and bound >= -best[0][0]:
+            break
+        heapq.heappop(queue)
+
+        key = (arch_fingerprint(arch), max_series) if objective == "waste" else None
+        result = mappings.get(key) if key is not None else None
+        if result is None:
+            result = run_mapper_batch(items, [arch], max_series=max_series,
+                                      objective=objective,
+                                      logic_block_counts=logic_block_counts, mapper=mapper)[0]
+            mapped += 1
+            if key is not None:
+                mappings[key] = result
+        evaluated += 1
+
+        area = evaluate_area(items, result["assignments"], result["overhead_luts"],
+                             logic_block_counts, arch)["geo_mean_area"]
+        if verbose:
+            print(f"  eval {describe(point):<48} bound={bound:.6g} area={area:.6g}")
+
+        if len(best) < top_n:
+            heapq.heappush(best, (-area, idx, point))
+        elif area < -best[0][0]:
+            heapq.heapreplace(best, (-area, idx, point))
+
+    ranked = sorted((-neg_area, point) for neg_area, _, point in best)
+    return {
+        "best": ranked,
+        "evaluated": evaluated,
+        "mapped": mapped,
+        "pruned": len(queue),
+        "total": len(points),
+    }
+
+
+def describe(point: DesignPoint) -> str:
+    brams, with_lutram = point
+    parts = ["LUTRAM"] if with_lutram else []
+    parts += [f"{s}b/W{w}/R{r}" for s, w, r in brams]
+    return " + ".join(parts)
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Branch-and-bound BRAM architecture exploration.")
+    parser.add_argument("--sizes", type=_int_list,
+                        default=[1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072],
+                        help="candidate BRAM sizes in bits")
+    parser.add_argument("--widths", type=_int_list, default=[8, 16, 32, 64, 128],
+                        help="candidate BRAM max widths")
+    parser.add_argument("--lbs", type=_int_list, default=[5, 10, 20, 40],
+                        help="candidate logic blocks per BRAM")
+    parser.add_argument("--brams", type=int, default=1, help="number of BRAM types (default 1)")
+    parser.add_argument("--lutram", action="store_true", help="include LUTRAM")
+    parser.add_argument("--top", type=int, default=5, help="number of architectures to report")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="waste")
+    parser.add_argument("--max-series", type=int, default=16)
+    parser.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    parser.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+    parser.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+    args = parser.parse_args(argv)
+
+    items, lb_counts = load_inputs(args.logical_rams_path, args.logic_block_count_path,
+                                   compact=True, sidecar=args.sidecar)
+    points = enumerate_points(args.sizes, args.widths, args.lbs, args.brams, args.lutram)
+    result = explore(items, lb_counts, points, top_n=args.top, max_series=args.max_series,
+                     objective=args.objective)
+
+    print("=" * 80)
+    print(f"[Explore] points={result['total']} evaluated={result['evaluated']} "
+          f"(mapped={result['mapped']}) pruned={result['pruned']}")
+    for rank, (area, point) in enumerate(result["best"], 1):
+        print(f"  #{rank} {describe(point):<48} Geometric Average Area: {area:.6g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+area_mapper.py
+--------------
+ECE1756 Assignment 3 - Area-Driven Mapping Refinement
+
+Description:
+  * Starts from the greedy minimum-waste mapping and moves logical RAMs between
+    physical RAM types to shrink each circuit's tile count.
+  * A circuit's size is set by whichever resource (logic, LUTRAM, each BRAM type)
+    runs out first, so moves are ranked by their effect on
+    (required tiles, sum of per-resource tile demands).
+  * Candidate moves live in a priority queue; each move is scored by updating the
+    circuit's resource counts incrementally instead of re-evaluating the circuit.
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+from area_model import resource_demands
+from ram_mapper_core import (MODE_REVERSE, Arch, Assignment, Items, best_config_per_type,
+                             item_column, series_overhead_luts)
+
+
+def _score(logic_blocks: int,
+           extra_luts: int,
+           counts: Dict[int, int],
+           arch: Arch) -> Tuple[int, int]:
+    """
+    Returns (required tiles, sum of resource demands), the quantity moves minimize.
+    """
+    demands = resource_demands(logic_blocks, extra_luts, counts, arch)
+    return max(demands), sum(demands)
+
+
+def _optimize_circuit(rows: List[int],
+                      options: List[Dict[int, Tuple[Assignment, int]]],
+                      current: List[Tuple[Assignment, int]],
+                      logic_blocks: int,
+                      arch: Arch,
+                      max_rounds: int) -> None:
+    """
+    Improves the assignments of one circuit in place.
+
+    options[k] maps type_id -> (Assignment, overhead LUTs) for rows[k];
+    current[k] is the (Assignment, overhead LUTs) in use.
+    """
+    counts: Dict[int, int] = {}
+    extra_luts = 0
+    for choice, luts in current:
+        counts[choice[0]] = counts.get(choice[0], 0) + choice[3] * choice[4]
+        extra_luts += luts
+
+    def move_delta(k: int, target: Tuple[Assignment, int]) -> Tuple[int, int]:
+        (src, src_luts), (dst, dst_luts) = current[k], target
+        counts[src[0]] -= src[3] * src[4]
+        counts[dst[0]] = counts.get(dst[0], 0) + dst[3] * dst[4]
+        moved = _score(logic_blocks, extra_luts - src_luts + dst_luts, counts, arch)
+        counts[dst[0]] -= dst[3] * dst[4]
+        counts[src[0]] += src[3] * src[4]
+        return moved[0] - score[0], moved[1] - score[1]
+
+    score = _score(logic_blocks, extra_luts, counts, arch)
+
+    for _ in range(max_rounds):
+        # Queue every currently-improving move, best first
+        heap: List[tuple] = []
+        for k in range(len(rows)):
+            src_type = current[k][0][0]
+            for type_id, target in options[k].items():
+                if type_id == src_type:
+                    continue
+                delta = move_delta(k, target)
+                if delta < (0, 0):
+                    heapq.heappush(heap, (delta, k, type_id, src_type))
+
+        applied = False
+        while heap:
+            delta, k, type_id, src_type = heapq.heappop(heap)
+            if current[k][0][0] != src_type:
+                continue  # stale: this RAM already moved
+
+            # Re-score against the current state; requeue if it fell behind
+            delta = move_delta(k, options[k][type_id])
+            if delta >= (0, 0):
+                continue
+            if heap and delta > heap[0][0]:
+                heapq.heappush(heap, (delta, k, type_id, src_type))
+                continue
+
+            (src, src_luts), (dst, dst_luts) = current[k], options[k][type_id]
+            counts[src[0]] -= src[3] * src[4]
+            counts[dst[0]] = counts.get(dst[0], 0) + dst[3] * dst[4]
+            extra_luts += dst_luts - src_luts
+            score = (score[0] + delta[0], score[1] + delta[1])
+            current[k] = options[k][type_id]
+            applied = True
+
+        if not applied:
+            break
+
+
+def optimize_area_mapping(items: Items,
+                          assignments: List[Assignment],
+                          logic_block_counts: Dict[int, int],
+                          arch: Arch,
+                          max_series: int = 16,
+                          max_rounds: int = 64) -> List[Assignment]:
+    """
+    Refines a mapping to reduce each circuit's required tiles.
+
+    Parameters:
+      items: Parsed logical RAMs, item dicts or a RamTable (not modified).
+      assignments: Starting Assignment per item (normally the greedy result).
+      logic_block_counts: Circuit ID -> logic blocks used by the circuit's logic.
+      arch: Architecture definition (needs lb_per_bram on every type).
+      max_series: Maximum allowable blocks in series (default 16).
+      max_rounds: Maximum number of queue rebuilds per circuit.
+
+    Returns a new list of Assignments.
+    """
+    result = list(assignments)
+    modes = item_column(items, "Mode")
+    depths = item_column(items, "Depth")
+    widths = item_column(items, "Width")
+    by_circuit: Dict[int, List[int]] = {}
+    for idx, circuit in enumerate(item_column(items, "Circuit")):
+        by_circuit.setdefault(circuit, []).append(idx)
+
+    # Per-type options are shared by every RAM of the same shape
+    shape_options: Dict[tuple, Dict[int, Tuple[Assignment, int]]] = {}
+
+    for circuit, rows in by_circuit.items():
+        options = []
+        current = []
+        for idx in rows:
+            mode_str, depth, width = MODE_REVERSE[modes[idx]], depths[idx], widths[idx]
+            shape = (mode_str, depth, width)
+            if shape not in shape_options:
+                shape_options[shape] = {
+                    type_id: (choice, sum(series_overhead_luts(choice[3], width, mode_str)))
+                    for type_id, choice in best_config_per_type(
+                        mode_str, depth, width, arch, max_series).items()
+                }
+            options.append(shape_options[shape])
+            choice = result[idx]
+            current.append((choice, sum(series_overhead_luts(choice[3], width, mode_str))))
+
+        _optimize_circuit(rows, options, current,
+                          logic_block_counts.get(circuit, 0), arch, max_rounds)
+        for idx, (choice, _) in zip(rows, current):
+            result[idx] = choice
+
+    return result
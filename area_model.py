@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+area_model.py
+-------------
+ECE1756 Assignment 3 - In-Process FPGA Area Evaluator
+
+Description:
+  * Computes per-circuit resource usage and FPGA area directly from a mapping
+    result, without writing a mapping file and running ./checker.
+  * Local stand-in for the checker's area model (assignment handout constants):
+      - Logic block tile: 35000 um^2, LUTRAM-capable logic block tile: 40000 um^2
+      - Block RAM tile: 9000 + 5*bits + 90*sqrt(bits) + 1200*max_width um^2
+      - 10 LUTs per logic block
+  * checker_command builds the external checker's command line for cross-checks
+    (run and parsed by checker_runner.py).
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+from ram_mapper_core import Arch, Assignment, Items, SplitAssignment, item_column
+
+LB_AREA = 35000.0
+LUTRAM_LB_AREA = 40000.0
+LUTS_PER_LB = 10
+
+
+def bram_area(capacity_bits: int, max_width: int) -> float:
+    """
+    Area of one Block RAM tile (dual-port, so the port width term is doubled).
+    """
+    return 9000 + 5 * capacity_bits + 90 * math.sqrt(capacity_bits) + 600 * 2 * max_width
+
+
+def is_lutram(ram: dict) -> bool:
+    """
+    Returns True if an architecture entry describes LUTRAM (a logic block used as memory).
+    """
+    return ram.get("phy_type") == "LUTRAM" or ram.get("name") == "LUTRAM"
+
+
+def ram_type_params(ram: dict) -> Tuple[bool, int, int]:
+    """
+    Returns (is_lutram, lb_per_bram, max_width) for an architecture entry.
+
+    For LUTRAM, lb_per_bram is the number of plain logic blocks per LUTRAM-capable one.
+    """
+    max_width = ram.get("max_width") or max((ram.get("width_options") or [1]))
+    return is_lutram(ram), ram["lb_per_bram"], max_width
+
+
+def tile_area(tiles: float, arch: Arch) -> float:
+    """
+    Area of a chip with the given number of logic block tiles, including the
+    LUTRAM-capable share of those tiles and the Block RAMs that come with them.
+    """
+    area = tiles * LB_AREA
+    for ram in arch:
+        lutram, lb_per_bram, max_width = ram_type_params(ram)
+        if lutram:
+            area += tiles / (1 + lb_per_bram) * (LUTRAM_LB_AREA - LB_AREA)
+        else:
+            area += tiles / lb_per_bram * bram_area(ram["capacity_bits"], max_width)
+    return area
+
+
+def resource_demands(logic_blocks: int,
+                     extra_luts: int,
+                     block_counts: Dict[int, int],
+                     arch: Arch) -> List[int]:
+    """
+    Returns the logic block tiles each resource needs on its own: logic (including
+    overhead LUTs and logic blocks used as LUTRAM) first, then one entry per RAM type.
+    """
+    lutram_blocks = 0
+    demands = [0]
+    for ram in arch:
+        count = block_counts.get(ram["type_id"], 0)
+        lutram, lb_per_bram, _ = ram_type_params(ram)
+        if lutram:
+            lutram_blocks += count
+            # Only 1 of every (1 + lb_per_bram) tiles can be used as LUTRAM
+            demands.append(count * (1 + lb_per_bram))
+        else:
+            demands.append(count * lb_per_bram)
+
+    # LUTRAM blocks cannot also hold logic
+    demands[0] = logic_blocks + math.ceil(extra_luts / LUTS_PER_LB) + lutram_blocks
+    return demands
+
+
+def required_tiles(logic_blocks: int,
+                   extra_luts: int,
+                   block_counts: Dict[int, int],
+                   arch: Arch) -> int:
+    """
+    Number of logic block tiles a circuit needs: whichever of logic, LUTRAM and
+    each Block RAM type runs out first sets the chip size.
+    """
+    return max(resource_demands(logic_blocks, extra_luts, block_counts, arch))
+
+
+def evaluate_area(items: Items,
+                  assignments: List[Assignment],
+                  overhead_luts: List[int],
+                  logic_block_counts: Dict[int, int],
+                  arch: Arch) -> dict:
+    """
+    Evaluates the FPGA area of a mapping result.
+
+    Parameters:
+      items: Parsed logical RAMs (item dicts or a RamTable).
+      assignments: Assignment (or SplitAssignment) per item
+                   (see ram_mapper_core.assign_rams_with_arch).
+      overhead_luts: Additional LUTs per item (see compute_overhead_luts).
+      logic_block_counts: Circuit ID -> logic blocks used by the circuit's logic.
+      arch: Architecture definition (needs lb_per_bram on every type).
+
+    Returns a dict with:
+      circuits: Circuit ID -> {logic_blocks, extra_luts, blocks (type_id -> count),
+                               tiles, area}
+      total_area: Sum of circuit areas.
+      geo_mean_area: Geometric mean of circuit areas.
+    """
+    # Circuit ID -> [extra LUTs, type_id -> physical block count]
+    usage: Dict[int, list] = {}
+    for circuit, choice, extra in zip(item_column(items, "Circuit"), assignments, overhead_luts):
+        if circuit not in usage:
+            usage[circuit] = [0, {}]
+        entry = usage[circuit]
+        entry[0] += int(extra)  # numpy engine overheads are int64
+        if isinstance(choice, SplitAssignment):
+            for group in choice:
+                entry[1][group[0]] = entry[1].get(group[0], 0) + group[3] * group[4]
+            continue
+        type_id = choice[0]
+        entry[1][type_id] = entry[1].get(type_id, 0) + choice[3] * choice[4]
+
+    circuits: Dict[int, dict] = {}
+    for circuit in sorted(set(logic_block_counts) | set(usage)):
+        extra_luts, blocks = usage.get(circuit, (0, {}))
+        logic_blocks = logic_block_counts.get(circuit, 0)
+        tiles = required_tiles(logic_blocks, extra_luts, blocks, arch)
+        circuits[circuit] = {
+            "logic_blocks": logic_blocks,
+            "extra_luts": extra_luts,
+            "blocks": blocks,
+            "tiles": tiles,
+            "area": tile_area(tiles, arch),
+        }
+
+    areas = [c["area"] for c in circuits.values()]
+    total_area = sum(areas)
+    if areas and min(areas) > 0:
+        geo_mean_area = math.exp(sum(math.log(a) for a in areas) / len(areas))
+    else:
+        geo_mean_area = 0.0
+
+    return {"circuits": circuits, "total_area": total_area, "geo_mean_area": geo_mean_area}
+
+
+def format_area_report(report: dict, arch: Arch) -> List[str]:
+    """
+    Formats an evaluate_area report as text lines (one per circuit plus totals).
+    """
+    type_ids = [ram["type_id"] for ram in arch]
+    header = f"{'Circuit':>7} {'LBs':>7} {'ExtraLUTs':>9} " + \
+        " ".join(f"{'Type' + str(t):>7}" for t in type_ids) + f" {'Tiles':>8} {'Area':>14}"
+    lines = [header]
+    for circuit, c in report["circuits"].items():
+        counts = " ".join(f"{c['blocks'].get(t, 0):>7}" for t in type_ids)
+        lines.append(f"{circuit:>7} {c['logic_blocks']:>7} {c['extra_luts']:>9} {counts} "
+                     f"{c['tiles']:>8} {c['area']:>14.6g}")
+    lines.append(f"Total Area: {report['total_area']:.6g}")
+    lines.append(f"Geometric Average Area: {report['geo_mean_area']:.6g}")
+    return lines
+
+
+# ------------------------- External Checker Cross-Check -------------------------
+
+def checker_command(arch: Arch,
+                    logical_rams_path: str,
+                    logic_block_count_path: str,
+                    mapping_path: str,
+                    checker: str = "./checker") -> List[str]:
+    """
+    Builds the ./checker command line describing arch (-l for LUTRAM, -b per Block RAM).
+    """
+    cmd = [checker, "-t"]
+    for ram in arch:
+        lutram, lb_per_bram, max_width = ram_type_params(ram)
+        if lutram:
+            cmd += ["-l", "1", str(lb_per_bram)]
+        else:
+            cmd += ["-b", str(ram["capacity_bits"]), str(max_width), str(lb_per_bram), "1"]
+    return cmd + [logical_rams_path, logic_block_count_path, mapping_path]
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_mapper.py
+---------------
+Scaling benchmark for the RAM mapper.
+
+Workflow:
+  * Generates synthetic logical_rams / logic_block_count files at 1x, 10x, 100x and
+    1000x the size of the course benchmark (more circuits, same per-circuit mix).
+  * Runs run_mapper with each reference architecture and times every stage
+    (parse, map, overhead, format) separately.
+  * Reports throughput (RAMs/sec) and peak traced memory, and saves everything to JSON
+    so results of two versions can be diffed (--compare).
+
+Usage:
+    python3 bench_mapper.py --scales 1,10,100 -o bench.json
+    python3 bench_mapper.py --scales 1,10,100 --compare bench_old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from ram_mapper_core import (MapperStats, build_arch_custom_example, build_arch_lutram_plus_bram,
+                             build_arch_one_bram, build_default_arch, run_mapper)
+
+# Size of the 1x workload (roughly the course benchmark)
+BASE_CIRCUITS = 69
+MAX_RAMS_PER_CIRCUIT = 40
+
+MODE_WEIGHTS = [("SimpleDualPort", 0.50), ("SinglePort", 0.25), ("ROM", 0.15), ("TrueDualPort", 0.10)]
+COMMON_WIDTHS = [1, 2, 4, 8, 9, 16, 18, 32, 36, 64, 72, 128, 144]
+
+ARCHITECTURES = {
+    "default": build_default_arch,
+    "one_bram_8k": lambda: build_arch_one_bram(8 * 1024, 32, 10),
+    "lutram_plus_bram_8k": lambda: build_arch_lutram_plus_bram(8 * 1024, 32, 10),
+    "custom_example": build_arch_custom_example,
+}
+
+
+def generate_workload(directory: str, scale: int, seed: int = 1756):
+    """
+    Writes a synthetic benchmark with BASE_CIRCUITS * scale circuits.
+    Returns (logical_rams_path, logic_block_count_path, num_rams).
+    """
+    rng = random.Random(seed * 1000003 + scale)
+    modes = [m for m, _ in MODE_WEIGHTS]
+    weights = [w for _, w in MODE_WEIGHTS]
+    num_circuits = BASE_CIRCUITS * scale
+
+    rams_path = os.path.join(directory, f"logical_rams_x{scale}.txt")
+    lbs_path = os.path.join(directory, f"logic_block_count_x{scale}.txt")
+    num_rams = 0
+
+    with open(rams_path, "w") as rams, open(lbs_path, "w") as lbs:
+        rams.write(f"Num_Circuits {num_circuits}\n")
+        rams.write("Circuit\tRamID\tMode\t\tDepth\tWidth\n")
+        lbs.write("Circuit\t# Logic blocks (N=10, k=6, fracturable)\n")
+
+        for circuit in range(num_circuits):
+            lbs.write(f"{circuit}\t{int(rng.lognormvariate(8, 1.2)) + 50}\n")
+            for ram_id in range(rng.randint(1, MAX_RAMS_PER_CIRCUIT)):
+                # Mostly power-of-two depths, some odd sizes, log-uniform from 2^2 to 2^15
+                depth = 2 ** rng.randint(2, 15)
+                if rng.random() < 0.3:
+                    depth = max(1, depth + rng.randint(-depth // 2, depth // 2))
+                width = rng.choice(COMMON_WIDTHS) if rng.random() < 0.7 else rng.randint(1, 144)
+                mode = rng.choices(modes, weights)[0]
+                rams.write(f"{circuit}\t{ram_id}\t{mode}\t\t{depth}\t{width}\n")
+                num_rams += 1
+
+    return rams_path, lbs_path, num_rams
+
+
+def bench_one(rams_path: str, lbs_path: str, arch_name: str, measure_memory: bool) -> dict:
+    """
+    Benchmarks one (workload, architecture) pair.
+    """
+    arch = ARCHITECTURES[arch_name]()
+
+    # End-to-end run_mapper, with per-stage times from its instrumentation
+    stats = MapperStats()
+    start = time.perf_counter()
+    lines = run_mapper(rams_path, lbs_path, arch, stats=stats)
+    total = time.perf_counter() - start
+    num_rams = len(lines)
+    del lines
+
+    peak_bytes = None
+    if measure_memory:
+        tracemalloc.start()
+        run_mapper(rams_path, lbs_path, arch)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "arch": arch_name,
+        "num_rams": num_rams,
+        "total_sec": total,
+        "rams_per_sec": num_rams / total if total > 0 else None,
+        "stage_sec": stats.stage_sec,
+        "counters": stats.counters,
+        "peak_traced_bytes": peak_bytes,
+    }
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], text=True,
+                             capture_output=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """
+    Prints the throughput ratio of every (scale, arch) present in both result files.
+    """
+    old = {(r["scale"], r["arch"]): r for r in baseline["results"]}
+    print("=" * 80)
+    print(f"[Compare] {baseline['revision']} -> {current['revision']}")
+    for r in current["results"]:
+        prev = old.get((r["scale"], r["arch"]))
+        if prev is None or not prev["rams_per_sec"]:
+            continue
+        ratio = r["rams_per_sec"] / prev["rams_per_sec"]
+        print(f"  x{r['scale']:<5} {r['arch']:<22} {prev['rams_per_sec']:>12.0f} -> "
+              f"{r['rams_per_sec']:>12.0f} RAMs/s ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the RAM mapper.")
+    parser.add_argument("--scales", default="1,10,100,1000",
+                        help="comma-separated workload scales (default 1,10,100,1000)")
+    parser.add_argument("--archs", default=",".join(ARCHITECTURES),
+                        help="comma-separated architectures to run")
+    parser.add_argument("--workdir", help="where to put generated inputs (default: temp dir)")
+    parser.add_argument("--seed", type=int, default=1756)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc pass (it slows the run down)")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",")]
+    arch_names = args.archs.split(",")
+    workdir = args.workdir or tempfile.mkdtemp(prefix="ram_bench_")
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    for scale in scales:
+        rams_path, lbs_path, num_rams = generate_workload(workdir, scale, args.seed)
+        for arch_name in arch_names:
+            r = bench_one(rams_path, lbs_path, arch_name, not args.no_memory)
+            r["scale"] = scale
+            results.append(r)
+            peak = f"{r['peak_traced_bytes'] / 1e6:.1f} MB" if r["peak_traced_bytes"] else "n/a"
+            stages = " ".join(f"{k}={v:.3f}s" for k, v in r["stage_sec"].items())
+            print(f"x{scale:<5} {arch_name:<22} {num_rams:>9} RAMs "
+                  f"{r['rams_per_sec']:>12.0f} RAMs/s  peak {peak:>10}  {stages}")
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"  -> results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+checker_runner.py
+-----------------
+ECE1756 Assignment 3 - Concurrent Checker Runner
+
+Description:
+  * Launches many ./checker invocations concurrently with asyncio, at most
+    `concurrency` at a time, each with a timeout.
+  * Failed runs (non-zero exit, timeout, or no area in the output) are retried and,
+    if they keep failing, flagged in their record instead of aborting the batch.
+  * Parses the checker's per-circuit and summary area lines into structured records.
+  * fake_checker.py is a local stand-in that accepts the same command line, so the
+    runner can be exercised without the real binary.
+"""
+
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional
+
+# Per-circuit line, e.g. "Circuit 12: ... Area: 1.2345e+08"
+_CIRCUIT_RE = re.compile(r"^\s*Circuit\s*#?\s*(\d+)\b.*?\bArea\b\D*?([0-9][0-9.]*(?:[eE][+-]?\d+)?)",
+                         re.IGNORECASE | re.MULTILINE)
+_GEO_AREA_RE = re.compile(r"Geometric Average Area\D*([0-9][0-9.]*(?:[eE][+-]?\d+)?)")
+_TOTAL_AREA_RE = re.compile(r"^\s*Total Area\D*([0-9][0-9.]*(?:[eE][+-]?\d+)?)", re.MULTILINE)
+
+STATUSES = ("ok", "failed", "timeout", "unparsed")
+
+
+def parse_checker_output(text: str) -> dict:
+    """
+    Extracts areas from checker output.
+
+    Returns a dict with:
+      circuits: Circuit ID -> area, for every per-circuit line found.
+      total_area: "Total Area" value, or None.
+      geo_mean_area: "Geometric Average Area" value, or None.
+    """
+    circuits: Dict[int, float] = {}
+    for match in _CIRCUIT_RE.finditer(text):
+        circuits[int(match.group(1))] = float(match.group(2))
+    geo = _GEO_AREA_RE.search(text)
+    total = _TOTAL_AREA_RE.search(text)
+    return {
+        "circuits": circuits,
+        "total_area": float(total.group(1)) if total else None,
+        "geo_mean_area": float(geo.group(1)) if geo else None,
+    }
+
+
+async def _run_once(cmd: List[str], timeout: Optional[float]) -> dict:
+    """
+    Runs one checker process; returns status, returncode, stdout and stderr.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE)
+    except OSError as exc:
+        return {"status": "failed", "returncode": None, "stdout": "", "stderr": str(exc)}
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return {"status": "timeout", "returncode": None, "stdout": "",
+                "stderr": f"checker timed out after {timeout}s"}
+
+    stdout = stdout.decode(errors="replace")
+    if proc.returncode != 0:
+        status = "failed"
+    elif parse_checker_output(stdout)["geo_mean_area"] is None:
+        status = "unparsed"
+    else:
+        status = "ok"
+    return {"status": status, "returncode": proc.returncode, "stdout": stdout,
+            "stderr": stderr.decode(errors="replace")}
+
+
+async def run_checker_async(cmd: List[str],
+                            timeout: Optional[float] = 300.0,
+                            retries: int = 1,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> dict:
+    """
+    Runs one checker command, retrying up to `retries` more times on failure.
+
+    Returns a record with cmd, status (one of STATUSES, from the last attempt),
+    attempts, returncode, stdout, stderr, elapsed (seconds over all attempts) and
+    the parsed circuits / total_area / geo_mean_area (see parse_checker_output).
+    """
+    start = time.perf_counter()
+    attempts = 0
+    while True:
+        attempts += 1
+        if semaphore is not None:
+            async with semaphore:
+                run = await _run_once(cmd, timeout)
+        else:
+            run = await _run_once(cmd, timeout)
+        if run["status"] == "ok" or attempts > retries:
+            break
+
+    record = {"cmd": cmd, "attempts": attempts, "elapsed": time.perf_counter() - start}
+    record.update(run)
+    record.update(parse_checker_output(run["stdout"]))
+    return record
+
+
+async def run_checkers_async(cmds: List[List[str]],
+                             concurrency: int = 4,
+                             timeout: Optional[float] = 300.0,
+                             retries: int = 1) -> List[dict]:
+    """
+    Runs every command with at most `concurrency` checkers alive at once.
+    Returns one record per command, in the order of cmds.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return list(await asyncio.gather(*(run_checker_async(cmd, timeout, retries, semaphore)
+                                       for cmd in cmds)))
+
+
+def run_checkers(cmds: List[List[str]],
+                 concurrency: int = 4,
+                 timeout: Optional[float] = 300.0,
+                 retries: int = 1) -> List[dict]:
+    """
+    Synchronous wrapper around run_checkers_async for scripts.
+    """
+    return asyncio.run(run_checkers_async(cmds, concurrency, timeout, retries))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fake_checker.py
+---------------
+ECE1756 Assignment 3 - Local Stand-In for ./checker
+
+Description:
+  * Accepts the ./checker command line built by area_model.checker_command
+    (-t, -d, "-l 1 <ratio>", "-b <bits> <max_width> <ratio> 1", then the logical RAM,
+    logic block count and mapping files).
+  * Reads the mapping file and prints per-circuit and summary areas computed with
+    area_model.py, in the format parsed by checker_runner.py. It does not check
+    the mapping for legality.
+  * For exercising checker_runner.py without the real binary:
+      FAKE_CHECKER_DELAY=<sec>  sleep before answering (timeouts)
+      FAKE_CHECKER_FAIL=<p>     exit with status 1 with probability p (retries)
+
+Usage:
+    python3 run_no_lutram_sweep.py --checker --checker-bin ./fake_checker.py
+"""
+
+import math
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+from area_model import required_tiles, tile_area
+from ram_mapper_core import build_default_arch, parse_logic_block_count
+
+
+def parse_args(argv: List[str]):
+    """
+    Returns (arch, [logical_rams, logic_block_count, mapping]) from a checker command line.
+    """
+    arch: List[dict] = []
+    files: List[str] = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "-t":
+            i += 1
+        elif arg == "-d":
+            arch = build_default_arch()
+            i += 1
+        elif arg == "-l":
+            arch.append({"type_id": len(arch) + 1, "phy_type": "LUTRAM", "name": "LUTRAM",
+                         "capacity_bits": 640, "max_width": 20,
+                         "lb_per_bram": int(argv[i + 2])})
+            i += 3
+        elif arg == "-b":
+            arch.append({"type_id": len(arch) + 1, "phy_type": "BRAM",
+                         "name": f"BRAM{int(argv[i + 1]) // 1024}K",
+                         "capacity_bits": int(argv[i + 1]), "max_width": int(argv[i + 2]),
+                         "lb_per_bram": int(argv[i + 3])})
+            i += 5
+        else:
+            files.append(arg)
+            i += 1
+    if not arch or len(files) != 3:
+        raise SystemExit("usage: fake_checker.py [-t] (-d | -l 1 R | -b BITS W R 1)... "
+                         "logical_rams logic_block_count mapping")
+    return arch, files
+
+
+def main(argv: List[str]) -> int:
+    delay = float(os.environ.get("FAKE_CHECKER_DELAY", "0"))
+    if delay > 0:
+        time.sleep(delay)
+    if random.random() < float(os.environ.get("FAKE_CHECKER_FAIL", "0")):
+        print("fake_checker: simulated failure", file=sys.stderr)
+        return 1
+
+    arch, (_, logic_block_count_path, mapping_path) = parse_args(argv)
+    lb_counts = parse_logic_block_count(logic_block_count_path)
+
+    # Circuit ID -> [extra LUTs, type_id -> physical block count]
+    usage: Dict[int, list] = {}
+    with open(mapping_path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 15:
+                continue
+            circuit, extra = int(parts[0]), int(parts[2])
+            series, parallel, ram_type = int(parts[10]), int(parts[12]), int(parts[14])
+            entry = usage.setdefault(circuit, [0, {}])
+            entry[0] += extra
+            entry[1][ram_type] = entry[1].get(ram_type, 0) + series * parallel
+
+    areas = []
+    for circuit in sorted(set(lb_counts) | set(usage)):
+        extra_luts, blocks = usage.get(circuit, (0, {}))
+        tiles = required_tiles(lb_counts.get(circuit, 0), extra_luts, blocks, arch)
+        area = tile_area(tiles, arch)
+        areas.append(area)
+        print(f"Circuit {circuit}: Tiles {tiles} Area: {area:.10g}")
+
+    print(f"Total Area: {sum(areas):.10g}")
+    geo = math.exp(sum(math.log(a) for a in areas) / len(areas)) if areas and min(areas) > 0 else 0.0
+    print(f"Geometric Average Area: {geo:.10g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+input_sidecar.py
+----------------
+ECE1756 Assignment 3 - Binary Input Sidecars
+
+Description:
+  * Compiles logical_rams.txt and logic_block_count.txt into binary sidecars
+    (<file>.cols next to each text file): a small JSON header followed by one
+    fixed-width typed column per field.
+  * Later runs memory-map the sidecar instead of re-tokenizing the text. The
+    RamTable input columns are read-only memoryviews over the mapping, so loading is
+    O(1) in the number of RAMs, and sweep workers share the same page-cache pages
+    instead of each holding a private copy.
+  * A sidecar records the size and mtime (ns) of its source file and is rebuilt
+    automatically when they no longer match (or when it is missing or unreadable).
+    If the directory is not writable, the text file is parsed as before.
+
+Usage:
+    python3 input_sidecar.py logical_rams.txt logic_block_count.txt   (compile ahead of time)
+    python3 run_with_lutram_sweep.py --sidecar
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, Optional, Tuple
+
+from ram_mapper_core import RamTable, parse_logic_block_count, parse_logical_rams
+
+SIDECAR_SUFFIX = ".cols"
+MAGIC = b"RAMCOLS\x00"
+FORMAT_VERSION = 1
+
+# Sidecar kind -> (column name, typecode) in file order
+KINDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "logical_rams": (("Circuit", "i"), ("RamID", "i"), ("Mode", "b"),
+                     ("Depth", "i"), ("Width", "i")),
+    "logic_block_count": (("Circuit", "i"), ("Blocks", "i")),
+}
+
+_LENGTH = struct.Struct("<I")
+_ALIGN = 8
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def sidecar_path(source_path: str) -> str:
+    return source_path + SIDECAR_SUFFIX
+
+
+def _source_stamp(source_path: str) -> dict:
+    st = os.stat(source_path)
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def _parse_columns(source_path: str, kind: str) -> Dict[str, array]:
+    """
+    Parses a text input into typed arrays, one per column of KINDS[kind].
+    """
+    if kind == "logical_rams":
+        table = parse_logical_rams(source_path, compact=True)
+        return {name: getattr(table, name) for name in RamTable.INPUT_COLUMNS}
+    counts = parse_logic_block_count(source_path)
+    return {"Circuit": array("i", counts.keys()), "Blocks": array("i", counts.values())}
+
+
+def build_sidecar(source_path: str, kind: str) -> str:
+    """
+    Parses source_path and writes its sidecar atomically (temp file + os.replace).
+    Returns the sidecar path.
+    """
+    stamp = _source_stamp(source_path)
+    columns = _parse_columns(source_path, kind)
+    rows = len(columns["Circuit"])
+
+    # Column offsets are relative to the (aligned) end of the header
+    layout = []
+    offset = 0
+    for name, typecode in KINDS[kind]:
+        layout.append([name, typecode, offset])
+        offset = _align(offset + rows * array(typecode).itemsize)
+    header = dict(stamp, version=FORMAT_VERSION, kind=kind, byteorder=sys.byteorder,
+                  rows=rows, columns=layout)
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header_bytes))
+
+    path = sidecar_path(source_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + _LENGTH.pack(len(header_bytes)) + header_bytes)
+            for name, typecode, column_offset in layout:
+                f.seek(data_start + column_offset)
+                columns[name].tofile(f)
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return path
+
+
+def open_sidecar(source_path: str, kind: str) -> Optional[Dict[str, memoryview]]:
+    """
+    Memory-maps an up-to-date sidecar of source_path and returns its columns as
+    read-only memoryviews, or None if the sidecar is missing, stale or unreadable.
+    """
+    try:
+        with open(sidecar_path(source_path), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # missing, or empty (cannot be mapped)
+        return None
+
+    try:
+        prefix = len(MAGIC) + _LENGTH.size
+        if mm[:len(MAGIC)] != MAGIC:
+            return None
+        (header_len,) = _LENGTH.unpack(mm[len(MAGIC):prefix])
+        header = json.loads(mm[prefix:prefix + header_len])
+        if (header.get("version") != FORMAT_VERSION or header.get("kind") != kind
+                or header.get("byteorder") != sys.byteorder
+                or [c[:2] for c in header["columns"]] != [list(c) for c in KINDS[kind]]):
+            return None
+        stamp = _source_stamp(source_path)
+        if any(header.get(key) != value for key, value in stamp.items()):
+            return None
+
+        data_start = _align(prefix + header_len)
+        rows = header["rows"]
+        view = memoryview(mm)
+        columns = {}
+        for name, typecode, offset in header["columns"]:
+            start = data_start + offset
+            end = start + rows * array(typecode).itemsize
+            if end > len(mm):
+                return None
+            columns[name] = view[start:end].cast(typecode)
+        return columns
+    except (ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+def load_columns(source_path: str, kind: str) -> Dict[str, memoryview]:
+    """
+    Returns the columns of source_path from its sidecar, (re)building the sidecar
+    first when needed. Falls back to parsing the text if it cannot be written.
+    """
+    columns = open_sidecar(source_path, kind)
+    if columns is not None:
+        return columns
+    try:
+        build_sidecar(source_path, kind)
+        columns = open_sidecar(source_path, kind)
+    except OSError:
+        pass
+    if columns is None:  # not writable, or the source changed again meanwhile
+        columns = {name: memoryview(column)
+                   for name, column in _parse_columns(source_path, kind).items()}
+    return columns
+
+
+def load_logical_rams(path: str) -> RamTable:
+    """
+    Sidecar-backed equivalent of parse_logical_rams(path, compact=True).
+    """
+    return RamTable.from_columns(load_columns(path, "logical_rams"))
+
+
+def load_logic_block_count(path: str) -> Dict[int, int]:
+    """
+    Sidecar-backed equivalent of parse_logic_block_count(path).
+    """
+    columns = load_columns(path, "logic_block_count")
+    return dict(zip(columns["Circuit"], columns["Blocks"]))
+
+
+def load_inputs(logical_rams_path: str,
+                logic_block_count_path: str) -> Tuple[RamTable, Dict[int, int]]:
+    """
+    Sidecar-backed equivalent of ram_mapper_core.load_inputs(..., compact=True).
+    """
+    return load_logical_rams(logical_rams_path), load_logic_block_count(logic_block_count_path)
+
+
+def main(argv=None):
+    paths = (argv if argv is not None else sys.argv[1:]) or ["logical_rams.txt",
+                                                             "logic_block_count.txt"]
+    if len(paths) != 2:
+        raise SystemExit("usage: input_sidecar.py [logical_rams.txt logic_block_count.txt]")
+    for path, kind in zip(paths, ("logical_rams", "logic_block_count")):
+        start = time.perf_counter()
+        out = build_sidecar(path, kind)
+        elapsed = time.perf_counter() - start
+        print(f"[Sidecar] {path} -> {out} ({os.path.getsize(out)} bytes, {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mapping_daemon.py
+-----------------
+ECE1756 Assignment 3 - Local Mapping Daemon
+
+Description:
+  * Long-running local service answering "map with this arch spec" and "area for
+    this arch spec" requests, so repeated calls skip interpreter start-up, input
+    parsing and architecture construction.
+  * Keeps in memory: the parsed inputs, validated Architectures (with their
+    precomputed candidate tables) keyed by spec, a ShapeCache and IncrementalMapper
+    shared by all requests, and the most recent results (mapping lines and area).
+  * The input files are stat'ed on every request; when their size or mtime changes
+    they are parsed again and every result that depends on them is dropped.
+  * Serves HTTP on 127.0.0.1 (--port) or on a Unix socket (--unix). Requests are
+    handled one at a time (mapping is CPU bound); /status answers in between.
+
+Endpoints (JSON request body, every field optional):
+    POST /map     {"arch": <spec>, "max_series": 16, "objective": "waste", "engine": "python"}
+                  -> mapping lines in checker format (text/plain)
+    POST /area    same body -> evaluate_area report (JSON)
+    GET  /status  -> inputs, cache sizes and counters (JSON)
+  <spec> is an architecture JSON spec as accepted by Architecture.from_spec (default:
+  the Stratix-IV-like architecture). Invalid requests return 400, unreadable inputs
+  503 and internal failures 500, all with {"error": "..."}.
+
+Usage:
+    python3 mapping_daemon.py serve [logical_rams.txt logic_block_count.txt] [--unix PATH]
+    python3 mapping_daemon.py map --arch my_arch.json -o ram_mapping.txt
+    python3 mapping_daemon.py area --arch my_arch.json
+    curl -s -d '{"arch": {"types": [...]}}' http://127.0.0.1:8756/area
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from area_model import evaluate_area
+from ram_mapper_core import (ENGINES, OBJECTIVES, Architecture, IncrementalMapper, ShapeCache,
+                             build_default_arch, load_inputs, run_mapper_batch)
+
+DEFAULT_PORT = 8756
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class MappingService:
+    """
+    Warm mapping state shared by all requests (see the module description).
+    Every public method takes the service lock.
+    """
+
+    def __init__(self,
+                 logical_rams_path: str,
+                 logic_block_count_path: str,
+                 sidecar: bool = False,
+                 max_archs: int = 64,
+                 max_results: int = 16):
+        self.paths = (logical_rams_path, logic_block_count_path)
+        self.sidecar = sidecar
+        self.max_archs = max_archs
+        self.max_results = max_results
+        self.lock = threading.Lock()
+        self.default_arch = Architecture(build_default_arch())
+        # Canonical spec JSON -> Architecture; survives input changes
+        self.archs: "OrderedDict[str, Architecture]" = OrderedDict()
+        # Shape decisions do not depend on the inputs, so the cache survives reloads too
+        self.cache = ShapeCache()
+        # (arch, max_series, objective) -> {"result", "mapping", "area"}; cleared on reload
+        self.results: "OrderedDict[tuple, dict]" = OrderedDict()
+        self.stamps: Optional[tuple] = None
+        self.items = None
+        self.lb_counts: Dict[int, int] = {}
+        self.mapper: Optional[IncrementalMapper] = None
+        self.counters = {"requests": 0, "reloads": 0, "result_hits": 0, "arch_hits": 0}
+
+    def _refresh(self) -> None:
+        """
+        Loads the inputs on first use and again whenever a file's size or mtime changed.
+        """
+        stamps = tuple(_stamp(path) for path in self.paths)
+        if stamps == self.stamps:
+            return
+        self.items, self.lb_counts = load_inputs(*self.paths, compact=True, sidecar=self.sidecar)
+        self.mapper = IncrementalMapper(self.items)
+        self.results.clear()
+        # Recheck: a file rewritten while it was parsed is parsed again on the next request
+        self.stamps = stamps if stamps == tuple(_stamp(path) for path in self.paths) else None
+        self.counters["reloads"] += 1
+
+    def _architecture(self, spec) -> Architecture:
+        if spec is None:
+            return self.default_arch
+        key = json.dumps(spec, sort_keys=True)
+        arch = self.archs.get(key)
+        if arch is not None:
+            self.archs.move_to_end(key)
+            self.counters["arch_hits"] += 1
+            return arch
+        arch = Architecture.from_spec(spec)
+        self.archs[key] = arch
+        if len(self.archs) > self.max_archs:
+            self.archs.popitem(last=False)
+        return arch
+
+    def _entry(self, request: dict) -> Tuple[Architecture, dict]:
+        """
+        Validates a request and returns its architecture and (cached) result entry.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("request body must be a JSON object")
+        unknown = set(request) - {"arch", "max_series", "objective", "engine"}
+        if unknown:
+            raise ValueError(f"unknown request fields: {', '.join(sorted(unknown))}")
+        max_series = request.get("max_series", 16)
+        if not isinstance(max_series, int) or isinstance(max_series, bool) or max_series < 1:
+            raise ValueError(f"max_series must be a positive integer, got {max_series!r}")
+        objective = request.get("objective", "waste")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown mapping objective '{objective}', "
+                             f"expected one of {OBJECTIVES}")
+        engine = request.get("engine", "python")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown mapping engine '{engine}', expected one of {ENGINES}")
+        arch = self._architecture(request.get("arch"))
+
+        self.counters["requests"] += 1
+        self._refresh()
+        # Engines produce identical mappings, so they share results
+        key = (arch, max_series, objective)
+        entry = self.results.get(key)
+        if entry is not None:
+            self.results.move_to_end(key)
+            self.counters["result_hits"] += 1
+            return arch, entry
+        result = run_mapper_batch(self.items, [arch], max_series=max_series, engine=engine,
+                                  cache=self.cache, objective=objective,
+                                  logic_block_counts=self.lb_counts,
+                                  mapper=self.mapper if objective == "waste" else None)[0]
+        # The numpy engine returns int64 arrays, which json cannot serialize
+        result["overhead_luts"] = [int(extra) for extra in result["overhead_luts"]]
+        entry = {"result": result, "mapping": None, "area": None}
+        self.results[key] = entry
+        if len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+        return arch, entry
+
+    def map(self, request: dict) -> bytes:
+        """
+        Returns the mapping file contents for the request.
+        """
+        with self.lock:
+            _, entry = self._entry(request)
+            if entry["mapping"] is None:
+                lines = entry["result"]["lines"]
+                entry["mapping"] = "".join(line + "\n" for line in lines).encode()
+            return entry["mapping"]
+
+    def area(self, request: dict) -> bytes:
+        """
+        Returns the evaluate_area report for the request as JSON.
+        """
+        with self.lock:
+            arch, entry = self._entry(request)
+            if entry["area"] is None:
+                result = entry["result"]
+                report = evaluate_area(self.items, result["assignments"], result["overhead_luts"],
+                                       self.lb_counts, arch)
+                entry["area"] = json.dumps(report).encode()
+            return entry["area"]
+
+    def status(self) -> bytes:
+        with self.lock:
+            return json.dumps({
+                "inputs": list(self.paths),
+                "loaded": self.stamps is not None,
+                "rams": len(self.items) if self.items is not None else 0,
+                "circuits": len(self.lb_counts),
+                "archs": len(self.archs),
+                "results": len(self.results),
+                "shape_cache": self.cache.stats(),
+                "counters": self.counters,
+            }).encode()
+
+
+# ------------------------- HTTP Server -------------------------
+
+class MappingHandler(BaseHTTPRequestHandler):
+    """
+    Routes /map, /area and /status to the server's MappingService.
+    """
+    server_version = "RamMapper/1"
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send(200, self.server.service.status())
+        else:
+            self._error(404, f"unknown path {self.path}")
+
+    def do_POST(self):
+        routes = {"/map": (self.server.service.map, "text/plain"),
+                  "/area": (self.server.service.area, "application/json")}
+        if self.path not in routes:
+            self._error(404, f"unknown path {self.path}")
+            return
+        handler, content_type = routes[self.path]
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            body = handler(request)
+        except ValueError as exc:  # includes malformed JSON and invalid arch specs
+            self._error(400, str(exc))
+            return
+        except OSError as exc:  # input files missing or unreadable
+            self._error(503, str(exc))
+            return
+        except Exception as exc:  # never drop the connection without a reply
+            self._error(500, f"{type(exc).__name__}: {exc}")
+            return
+        self._send(200, body, content_type)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(service: MappingService,
+          port: int = DEFAULT_PORT,
+          unix_path: Optional[str] = None,
+          verbose: bool = False) -> None:
+    """
+    Serves the service on 127.0.0.1:port, or on the Unix socket unix_path, until
+    interrupted (Ctrl-C or SIGTERM).
+    """
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)  # stale socket of a previous daemon
+        server = UnixHTTPServer(unix_path, MappingHandler)
+        where = unix_path
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), MappingHandler)
+        server.daemon_threads = True
+        where = f"http://127.0.0.1:{port}"
+    server.service = service
+    server.verbose = verbose
+    # shutdown() waits for serve_forever, so it cannot run in the main thread's handler
+    signal.signal(signal.SIGTERM,
+                  lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"[Daemon] serving {service.paths[0]}, {service.paths[1]} on {where}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+
+
+# ------------------------- Client -------------------------
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def call(path: str,
+         request: Optional[dict] = None,
+         port: int = DEFAULT_PORT,
+         unix_path: Optional[str] = None,
+         timeout: float = 600.0) -> bytes:
+    """
+    Sends one request to a running daemon (GET without a request, POST with one) and
+    returns the response body. Raises RuntimeError with the daemon's message on errors.
+    """
+    if unix_path:
+        conn = _UnixHTTPConnection(unix_path, timeout)
+    else:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        if request is None:
+            conn.request("GET", path)
+        else:
+            conn.request("POST", path, body=json.dumps(request).encode(),
+                         headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        try:
+            message = json.loads(body)["error"]
+        except (ValueError, KeyError, TypeError):
+            message = body.decode(errors="replace")
+        raise RuntimeError(f"daemon returned {response.status}: {message}")
+    return body
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Local mapping daemon and its client.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    server = sub.add_parser("serve", help="run the daemon")
+    server.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+    server.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+    server.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    server.add_argument("--max-results", type=int, default=16,
+                        help="mapping results kept in memory (default 16)")
+    server.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    mapping = sub.add_parser("map", help="request a mapping")
+    mapping.add_argument("-o", "--output", help="mapping file (default: stdout)")
+    area = sub.add_parser("area", help="request the area of a mapping")
+    area.add_argument("--json", action="store_true", help="print the full per-circuit report")
+    status = sub.add_parser("status", help="show the daemon's state")
+    for p in (mapping, area):
+        p.add_argument("--arch", help="architecture JSON spec (default: Stratix-IV-like architecture)")
+        p.add_argument("--engine", choices=ENGINES, default="python")
+        p.add_argument("--objective", choices=OBJECTIVES, default="waste")
+        p.add_argument("--max-series", type=int, default=16)
+    for p in (server, mapping, area, status):
+        p.add_argument("--port", type=int, default=DEFAULT_PORT)
+        p.add_argument("--unix", metavar="PATH", help="Unix socket instead of 127.0.0.1:PORT")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        service = MappingService(args.logical_rams_path, args.logic_block_count_path,
+                                 sidecar=args.sidecar, max_results=args.max_results)
+        serve(service, port=args.port, unix_path=args.unix, verbose=args.verbose)
+        return
+    if args.command == "status":
+        body = call("/status", port=args.port, unix_path=args.unix)
+        print(json.dumps(json.loads(body), indent=2))
+        return
+
+    request = {"max_series": args.max_series, "objective": args.objective, "engine": args.engine}
+    if args.arch:
+        with open(args.arch, "r") as f:
+            request["arch"] = json.load(f)
+    start = time.perf_counter()
+    try:
+        body = call("/" + args.command, request, port=args.port, unix_path=args.unix)
+    except RuntimeError as exc:
+        raise SystemExit(str(exc))
+    elapsed = time.perf_counter() - start
+
+    if args.command == "map":
+        if args.output:
+            with open(args.output, "wb") as out:
+                out.write(body)
+        else:
+            sys.stdout.buffer.write(body)
+        print(f"[Daemon] mapping in {elapsed * 1000:.1f} ms", file=sys.stderr)
+        return
+
+    report = json.loads(body)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    print(f"Total Area: {report['total_area']:.10g}")
+    print(f"Geometric Average Area: {report['geo_mean_area']:.10g}")
+    print(f"[Daemon] area in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,17 @@ Description:
   * Used by other scripts to run specific mapping tasks (default, sweeps, custom).
 """
 
+import bisect
+import functools
+import itertools
+import json
 import math
-from typing import Dict, List, Tuple
+import time
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
 # ------------------------- Mode Enumeration -------------------------
 
@@ -24,56 +33,194 @@ MODE_MAP: Dict[str, int] = {
 
 MODE_REVERSE: Dict[int, str] = {v: k for k, v in MODE_MAP.items()}
 
+# Mapping decision for one logical RAM:
+# (RAM_type, small_depthchoose, small_widthchoose, small_depthnum, small_widthnum)
+Assignment = Tuple[int, int, int, int, int]
+
+
+# ------------------------- Compact Records -------------------------
+
+class RamTable:
+    """
+    Struct-of-arrays store for logical RAMs: one typed array per field instead of
+    one dict per RAM (~40 bytes per RAM instead of several hundred).
+
+    Column names match the item dict keys, and every core function accepts a
+    RamTable wherever it accepts a list of item dicts. Indexing or iterating
+    yields row dicts (copies), for code that only reads individual items; rows
+    of a table whose output columns are not sized yet (see ensure_outputs) read
+    as unmapped, like freshly parsed item dicts.
+    Input columns may also be read-only memoryviews (see input_sidecar.py).
+    """
+
+    # Input columns, then mapping outputs (RAM_type 0 = not mapped yet)
+    INPUT_COLUMNS = ("Circuit", "RamID", "Mode", "Depth", "Width")
+    OUTPUT_COLUMNS = ("RAM_type", "small_depthchoose", "small_widthchoose",
+                      "small_depthnum", "small_widthnum")
+    __slots__ = INPUT_COLUMNS + OUTPUT_COLUMNS
+
+    def __init__(self):
+        self.Circuit = array("i")
+        self.RamID = array("i")
+        self.Mode = array("b")
+        self.Depth = array("i")
+        self.Width = array("i")
+        for name in self.OUTPUT_COLUMNS:
+            setattr(self, name, array("i"))
+
+    def __len__(self) -> int:
+        return len(self.Circuit)
+
+    def __getitem__(self, idx: int) -> dict:
+        row = {name: getattr(self, name)[idx] for name in self.INPUT_COLUMNS}
+        row["ModeStr"] = MODE_REVERSE[row["Mode"]]
+        mapped = len(self.RAM_type) == len(self.Circuit)
+        for name in self.OUTPUT_COLUMNS:
+            row[name] = getattr(self, name)[idx] if mapped else 0
+        if row["RAM_type"] == 0:
+            row["RAM_type"] = None
+        return row
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self[idx] for idx in range(len(self)))
+
+    def append(self, circuit: int, ram_id: int, mode: int, depth: int, width: int) -> None:
+        self.Circuit.append(circuit)
+        self.RamID.append(ram_id)
+        self.Mode.append(mode)
+        self.Depth.append(depth)
+        self.Width.append(width)
+
+    def column(self, name: str):
+        """
+        Returns a column by item key; "ModeStr" is derived from the Mode codes.
+        """
+        if name == "ModeStr":
+            return [MODE_REVERSE[m] for m in self.Mode]
+        return getattr(self, name)
+
+    def ensure_outputs(self) -> None:
+        """
+        Sizes the mapping output columns to the number of rows.
+        """
+        n = len(self)
+        for name in self.OUTPUT_COLUMNS:
+            col = getattr(self, name)
+            if len(col) != n:
+                setattr(self, name, array("i", bytes(4 * n)))
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> "RamTable":
+        table = cls()
+        for item in items:
+            table.append(item["Circuit"], item["RamID"], item["Mode"], item["Depth"], item["Width"])
+        return table
+
+    def take(self, rows: Iterable[int]) -> "RamTable":
+        """
+        Returns a new table holding the input columns of the given rows, in that order.
+        """
+        rows = rows if isinstance(rows, (list, array, range)) else list(rows)
+        table = RamTable()
+        for name in self.INPUT_COLUMNS:
+            col = getattr(self, name)
+            setattr(table, name, array(getattr(table, name).typecode, [col[idx] for idx in rows]))
+        return table
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Iterable[int]]) -> "RamTable":
+        """
+        Wraps existing input columns (typed arrays or memoryviews) without copying.
+        """
+        table = cls()
+        for name in cls.INPUT_COLUMNS:
+            setattr(table, name, columns[name])
+        if len({len(getattr(table, name)) for name in cls.INPUT_COLUMNS}) != 1:
+            raise ValueError("RamTable input columns must all have the same length")
+        return table
+
+
+# Anything the core functions accept as a set of logical RAMs
+Items = Union[List[dict], RamTable]
+
+
+def item_column(items: Items, name: str):
+    """
+    Returns one field of every logical RAM as a sequence (zero-copy for a RamTable).
+    """
+    if isinstance(items, RamTable):
+        return items.column(name)
+    return [item[name] for item in items]
+
 
 # ------------------------- Input Parsing -------------------------
 
-def parse_logical_rams(path: str) -> List[dict]:
+def iter_logical_rams(path: str) -> Iterator[dict]:
     """
-    Parses the logical_rams.txt file.
+    Streams the logical_rams.txt file one item at a time.
     Format: <Circuit> <RamID> <Mode> <Depth> <Width>
     """
-    items: List[dict] = []
     with open(path, "r") as f:
-        lines = f.readlines()
+        # Skip header lines
+        for line in itertools.islice(f, 2, None):
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) != 5:
+                continue
 
-    # Skip header lines
-    for line in lines[2:]:
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split()
-        if len(parts) != 5:
-            continue
+            circuit_id = int(parts[0])
+            ram_id = int(parts[1])
+            mode_str = parts[2]
+            depth = int(parts[3])
+            width = int(parts[4])
 
-        circuit_id = int(parts[0])
-        ram_id = int(parts[1])
-        mode_str = parts[2]
-        depth = int(parts[3])
-        width = int(parts[4])
+            if mode_str not in MODE_MAP:
+                continue
 
-        if mode_str not in MODE_MAP:
-            continue
+            mode_val = MODE_MAP[mode_str]
 
-        mode_val = MODE_MAP[mode_str]
-
-        item = {
-            "Circuit": circuit_id,
-            "RamID": ram_id,
-            "Mode": mode_val,
-            "ModeStr": mode_str,
-            "Depth": depth,
-            "Width": width,
-
-            # Fields to be filled by the mapping algorithm
-            "RAM_type": None,             # Physical RAM type ID
-            "small_depthchoose": 0,       # Physical block depth D
-            "small_widthchoose": 0,       # Physical block width W
-            "small_depthnum": 0,          # Number of blocks in series (S)
-            "small_widthnum": 0,          # Number of blocks in parallel (P)
-        }
-        items.append(item)
+            yield {
+                "Circuit": circuit_id,
+                "RamID": ram_id,
+                "Mode": mode_val,
+                "ModeStr": mode_str,
+                "Depth": depth,
+                "Width": width,
+
+                # Fields to be filled by the mapping algorithm
+                "RAM_type": None,             # Physical RAM type ID
+                "small_depthchoose": 0,       # Physical block depth D
+                "small_widthchoose": 0,       # Physical block width W
+                "small_depthnum": 0,          # Number of blocks in series (S)
+                "small_widthnum": 0,          # Number of blocks in parallel (P)
+            }
+
+
+def parse_logical_rams(path: str, compact: bool = False) -> Items:
+    """
+    Parses the logical_rams.txt file.
+    Format: <Circuit> <RamID> <Mode> <Depth> <Width>
+
+    compact=True returns a RamTable instead of a list of item dicts.
+    """
+    if not compact:
+        return list(iter_logical_rams(path))
 
-    return items
+    table = RamTable()
+    append = table.append
+    with open(path, "r") as f:
+        # Skip header lines
+        for line in itertools.islice(f, 2, None):
+            parts = line.split()
+            if len(parts) != 5:
+                continue
+            mode_val = MODE_MAP.get(parts[2])
+            if mode_val is None:
+                continue
+            append(int(parts[0]), int(parts[1]), mode_val, int(parts[3]), int(parts[4]))
+    return table
 
 
 def parse_logic_block_count(path: str) -> Dict[int, int]:
@@ -102,23 +249,43 @@ def parse_logic_block_count(path: str) -> Dict[int, int]:
     return counts
 
 
+def load_inputs(logical_rams_path: str,
+                logic_block_count_path: str,
+                compact: bool = False,
+                sidecar: bool = False) -> Tuple[Items, Dict[int, int]]:
+    """
+    Parses both benchmark files once, for reuse across many architectures.
+    compact=True parses the logical RAMs into a RamTable.
+    sidecar=True memory-maps binary sidecars of both files instead (built on first
+    use and whenever a text file changes; see input_sidecar.py); implies compact.
+    """
+    if sidecar:
+        from input_sidecar import load_inputs as load_inputs_sidecar
+        return load_inputs_sidecar(logical_rams_path, logic_block_count_path)
+    return (parse_logical_rams(logical_rams_path, compact=compact),
+            parse_logic_block_count(logic_block_count_path))
+
+
 # ------------------------- Architecture Definitions -------------------------
 
 def build_default_arch() -> List[dict]:
     """
     Constructs the default Stratix-IV-like architecture.
     
-    Type 1: LUTRAM (640 bits)
-    Type 2: 8k BRAM (8192 bits)
-    Type 3: 128k BRAM (131072 bits)
+    Type 1: LUTRAM (640 bits, 50% of logic blocks)
+    Type 2: 8k BRAM (8192 bits, 1 per 10 logic blocks)
+    Type 3: 128k BRAM (131072 bits, 1 per 300 logic blocks)
     """
     arch: List[dict] = []
 
     # Type 1: LUTRAM (No TrueDualPort support)
     arch.append({
         "type_id": 1,
+        "phy_type": "LUTRAM",
         "name": "LUTRAM",
         "capacity_bits": 640,
+        "max_width": 20,
+        "lb_per_bram": 1,
         "width_options": [10, 20],
         "width_options_tdp": [],
     })
@@ -126,8 +293,11 @@ def build_default_arch() -> List[dict]:
     # Type 2: 8k BRAM
     arch.append({
         "type_id": 2,
+        "phy_type": "Block RAM",
         "name": "BRAM8K",
         "capacity_bits": 8192,
+        "max_width": 32,
+        "lb_per_bram": 10,
         "width_options": [1, 2, 4, 8, 16, 32],
         "width_options_tdp": [1, 2, 4, 8, 16],
     })
@@ -135,8 +305,11 @@ def build_default_arch() -> List[dict]:
     # Type 3: 128k BRAM
     arch.append({
         "type_id": 3,
+        "phy_type": "Block RAM",
         "name": "BRAM128K",
         "capacity_bits": 131072,
+        "max_width": 128,
+        "lb_per_bram": 300,
         "width_options": [1, 2, 4, 8, 16, 32, 64, 128],
         "width_options_tdp": [1, 2, 4, 8, 16, 32, 64],
     })
@@ -144,10 +317,10 @@ def build_default_arch() -> List[dict]:
     return arch
 
 
-def build_arch_one_bram(size_bits, max_width, lbs_per_bram):
+def bram_width_options(size_bits: int, max_width: int) -> Tuple[List[int], List[int]]:
     """
-    Constructs an architecture with a single Block RAM type (Part e).
-    Width options are powers of 2 up to max_width.
+    Returns the (single-port, TrueDualPort) width options of a Block RAM:
+    powers of 2 up to max_width that divide size_bits, TrueDualPort up to max_width / 2.
     """
     # Calculate valid single-port widths
     width_options = []
@@ -160,6 +333,15 @@ def build_arch_one_bram(size_bits, max_width, lbs_per_bram):
     # TrueDualPort max width is half of the single-port max width
     tdp_max_width = max_width // 2
     width_options_tdp = [w for w in width_options if w <= tdp_max_width]
+    return width_options, width_options_tdp
+
+
+def build_arch_one_bram(size_bits, max_width, lbs_per_bram):
+    """
+    Constructs an architecture with a single Block RAM type (Part e).
+    Width options are powers of 2 up to max_width.
+    """
+    width_options, width_options_tdp = bram_width_options(size_bits, max_width)
 
     arch = [
         {
@@ -192,15 +374,7 @@ def build_arch_lutram_plus_bram(size_bits, max_width, lbs_per_bram):
     }
 
     # Custom Block RAM resources
-    width_options = []
-    w = 1
-    while w <= max_width and w <= size_bits:
-        if size_bits % w == 0:
-            width_options.append(w)
-        w *= 2
-
-    tdp_max_width = max_width // 2
-    width_options_tdp = [w for w in width_options if w <= tdp_max_width]
+    width_options, width_options_tdp = bram_width_options(size_bits, max_width)
 
     bram_entry = {
         "type_id": 2,
@@ -261,99 +435,1219 @@ def build_arch_custom_example() -> List[dict]:
 
     return arch
 
+
+def build_arch_multi_bram(brams: List[Tuple[int, int, int]],
+                          with_lutram: bool = True) -> List[dict]:
+    """
+    Constructs an architecture with optional LUTRAM plus several Block RAM types,
+    following the structure of build_arch_custom_example.
+
+    brams: (size_bits, max_width, lb_per_bram) per Block RAM type, in type order.
+    """
+    arch: List[dict] = []
+
+    if with_lutram:
+        arch.append({
+            "type_id": 1,
+            "phy_type": "LUTRAM",
+            "name": "LUTRAM",
+            "capacity_bits": 640,
+            "max_width": 20,
+            "lb_per_bram": 1,
+            "width_options": [10, 20],
+            "width_options_tdp": [],
+        })
+
+    for size_bits, max_width, lb_per_bram in brams:
+        width_options, width_options_tdp = bram_width_options(size_bits, max_width)
+        arch.append({
+            "type_id": len(arch) + 1,
+            "phy_type": "Block RAM",
+            "name": f"BRAM{size_bits // 1024}K" if size_bits % 1024 == 0 else f"BRAM{size_bits}",
+            "capacity_bits": size_bits,
+            "max_width": max_width,
+            "lb_per_bram": lb_per_bram,
+            "width_options": width_options,
+            "width_options_tdp": width_options_tdp,
+        })
+
+    return arch
+
+
+# ------------------------- Architecture Objects -------------------------
+
+LUTRAM_DEFAULTS = {"capacity_bits": 640, "max_width": 20,
+                   "width_options": (10, 20), "width_options_tdp": ()}
+
+
+class RamType(Mapping):
+    """
+    One immutable RAM type of an Architecture.
+
+    Reads like the architecture dicts (ram["capacity_bits"], ram.get("width_options")),
+    so every function taking a list of dicts also takes an Architecture; width
+    options are tuples.
+    """
+
+    __slots__ = ("_fields", "_hash")
+
+    def __init__(self, fields: dict):
+        object.__setattr__(self, "_fields", dict(fields))
+        object.__setattr__(self, "_hash", hash(tuple(self._fields.items())))
+
+    def __getitem__(self, key):
+        return self._fields[key]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RamType is immutable")
+
+    def __reduce__(self):
+        return RamType, (self._fields,)
+
+    def __repr__(self) -> str:
+        return f"RamType({self._fields!r})"
+
+
+def _check_positive_int(fields: dict, key: str) -> None:
+    value = fields.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise ValueError(f"RAM type {fields['type_id']}: {key} must be a positive integer, "
+                         f"got {value!r}")
+
+
+def _check_width_list(fields: dict, key: str) -> None:
+    value = fields.get(key)
+    if value is None:
+        return
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"RAM type {fields['type_id']}: {key} must be a list, got {value!r}")
+    for width in value:
+        if not isinstance(width, int) or isinstance(width, bool) or width <= 0:
+            raise ValueError(f"RAM type {fields['type_id']}: {key} entry {width!r} "
+                             f"is not a positive integer")
+
+
+def _frozen_value(type_id, key: str, value):
+    """
+    Returns value with lists turned into tuples, so it can be part of a RamType hash;
+    raises ValueError for values that stay unhashable (objects).
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen_value(type_id, key, v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        raise ValueError(f"RAM type {type_id}: unsupported value for {key}: {value!r}") from None
+    return value
+
+
+def _normalize_ram_type(ram: dict, position: int) -> dict:
+    """
+    Fills in the keys a RAM type entry may omit and returns a complete field dict:
+    type_id (position + 1), phy_type / name (from each other), LUTRAM defaults,
+    Block RAM width options (bram_width_options from max_width) and max_width.
+    Raw fields are type-checked before anything is derived from them, so every bad
+    entry raises ValueError.
+    """
+    fields = dict(ram)
+    fields.setdefault("type_id", position + 1)
+    _check_positive_int(fields, "type_id")
+    for key in ("capacity_bits", "max_width", "lb_per_bram"):
+        if key in fields:
+            _check_positive_int(fields, key)
+    for key in ("width_options", "width_options_tdp"):
+        _check_width_list(fields, key)
+    for key in ("phy_type", "name"):
+        if key in fields and not isinstance(fields[key], str):
+            raise ValueError(f"RAM type {fields['type_id']}: {key} must be a string, "
+                             f"got {fields[key]!r}")
+    if fields.get("phy_type") in ("BRAM", "bram"):
+        fields["phy_type"] = "Block RAM"
+    lutram = fields.get("phy_type") == "LUTRAM" or fields.get("name") == "LUTRAM"
+    fields.setdefault("phy_type", "LUTRAM" if lutram else "Block RAM")
+
+    if lutram:
+        for key, value in LUTRAM_DEFAULTS.items():
+            fields.setdefault(key, value)
+        fields.setdefault("name", "LUTRAM")
+    else:
+        if "capacity_bits" not in fields:
+            raise ValueError(f"RAM type {fields['type_id']}: capacity_bits is required")
+        if "width_options" not in fields:
+            if "max_width" not in fields:
+                raise ValueError(f"RAM type {fields['type_id']}: "
+                                 f"needs width_options or max_width")
+            widths, widths_tdp = bram_width_options(fields["capacity_bits"], fields["max_width"])
+            fields["width_options"] = widths
+            fields.setdefault("width_options_tdp", widths_tdp)
+        size_bits = fields["capacity_bits"]
+        fields.setdefault("name", f"BRAM{size_bits // 1024}K" if size_bits % 1024 == 0
+                          else f"BRAM{size_bits}")
+
+    fields["width_options"] = tuple(fields.get("width_options") or ())
+    fields["width_options_tdp"] = tuple(fields.get("width_options_tdp") or ())
+    if "max_width" not in fields and fields["width_options"]:
+        fields["max_width"] = max(fields["width_options"])
+    if "lb_per_bram" not in fields:
+        raise ValueError(f"RAM type {fields['type_id']}: lb_per_bram is required")
+    for key, value in fields.items():
+        fields[key] = _frozen_value(fields["type_id"], key, value)
+    return fields
+
+
+def _validate_ram_type(fields: dict) -> None:
+    type_id = fields["type_id"]
+    for key in ("type_id", "capacity_bits", "max_width", "lb_per_bram"):
+        _check_positive_int(fields, key)
+    if not fields["width_options"] and not fields["width_options_tdp"]:
+        raise ValueError(f"RAM type {type_id}: no width options")
+    for key in ("width_options", "width_options_tdp"):
+        for width in fields[key]:
+            if not isinstance(width, int) or width <= 0 or fields["capacity_bits"] % width != 0:
+                raise ValueError(f"RAM type {type_id}: {key} entry {width!r} does not divide "
+                                 f"capacity_bits={fields['capacity_bits']}")
+
+
+class Architecture(tuple):
+    """
+    Immutable, hashable architecture: a tuple of RamType in type order.
+
+    Built from the usual list of dicts (Architecture(build_default_arch())) or from a
+    JSON spec (Architecture.from_json). Entries are completed and validated once on
+    construction, and the per-mode (type_id, phys_width, phys_depth) candidate table,
+    arch_fingerprint and pruned-width tables are precomputed. Pickling only ships the
+    RAM types; the tables are rebuilt on load.
+    """
+
+    def __new__(cls, types: Iterable[Mapping]):
+        rams = []
+        seen = set()
+        for position, ram in enumerate(types):
+            fields = _normalize_ram_type(ram, position)
+            _validate_ram_type(fields)
+            if fields["type_id"] in seen:
+                raise ValueError(f"Duplicate RAM type_id {fields['type_id']}")
+            seen.add(fields["type_id"])
+            rams.append(RamType(fields))
+        if not rams:
+            raise ValueError("An architecture needs at least one RAM type")
+
+        self = super().__new__(cls, rams)
+        candidates = {
+            tdp: tuple((ram["type_id"], w, ram["capacity_bits"] // w)
+                       for ram in rams for w in ram[key])
+            for tdp, key in ((False, "width_options"), (True, "width_options_tdp"))
+        }
+        object.__setattr__(self, "_candidates", candidates)
+        object.__setattr__(self, "_fingerprint", tuple(
+            (ram["type_id"], ram["capacity_bits"], ram["width_options"], ram["width_options_tdp"])
+            for ram in rams))
+        object.__setattr__(self, "_prepared", [
+            (ram["type_id"], ram["capacity_bits"], {
+                False: prepare_widths(ram["width_options"], ram["capacity_bits"]),
+                True: prepare_widths(ram["width_options_tdp"], ram["capacity_bits"]),
+            }) for ram in rams])
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Architecture is immutable")
+
+    def __reduce__(self):
+        return Architecture, (tuple(self),)
+
+    @classmethod
+    def from_spec(cls, spec: Union[dict, list]) -> "Architecture":
+        """
+        Builds an architecture from a parsed JSON spec: a list of RAM types, or
+        {"types": [...]}. Each type needs lb_per_bram; LUTRAM types ("phy_type":
+        "LUTRAM") default to 640 bits with widths 10/20, and Block RAMs may give just
+        capacity_bits and max_width (power-of-2 widths as in build_arch_one_bram).
+        """
+        types = spec.get("types") if isinstance(spec, dict) else spec
+        if not isinstance(types, list) or not all(isinstance(ram, dict) for ram in types):
+            raise ValueError('Architecture spec must be a list of RAM types or {"types": [...]}')
+        return cls(types)
+
+    @classmethod
+    def from_json(cls, path: str) -> "Architecture":
+        with open(path, "r") as f:
+            return cls.from_spec(json.load(f))
+
+    def candidates(self, mode_str: str) -> Tuple[Tuple[int, int, int], ...]:
+        """
+        Precomputed mode_candidates(self, mode_str).
+        """
+        return self._candidates[mode_str == "TrueDualPort"]
+
+    @property
+    def fingerprint(self) -> tuple:
+        return self._fingerprint
+
+    @property
+    def prepared_widths(self) -> List[tuple]:
+        return self._prepared
+
+    def to_dicts(self) -> List[dict]:
+        """
+        Returns the architecture as a list of plain dicts (width options as lists).
+        """
+        return arch_to_dicts(self)
+
+
+# Anything the mapping entry points accept as an architecture
+Arch = Union[List[dict], Architecture]
+
+
+def arch_to_dicts(arch: Arch) -> List[dict]:
+    """
+    Returns a JSON-serializable copy of an architecture (list of dicts or Architecture).
+    """
+    return [{key: list(value) if isinstance(value, tuple) else value for key, value in ram.items()}
+            for ram in arch]
+
+
+def load_architecture(path: str) -> Architecture:
+    """
+    Loads and validates an architecture from a JSON spec file (see Architecture.from_spec).
+    """
+    return Architecture.from_json(path)
+
+
 # ------------------------- Core Mapping Algorithm -------------------------
 
-def map_rams_with_arch(items: List[dict],
-                       arch: List[dict],
-                       max_series: int = 16) -> None:
+def mode_candidates(arch: Arch, mode_str: str) -> List[Tuple[int, int, int]]:
     """
-    Selects the physical RAM implementation that minimizes bit waste for each logical RAM.
-    
+    Lists the (type_id, phys_width, phys_depth) configurations available to a mode.
+
+    The order matches the enumeration order of map_rams_with_arch (RAM type first,
+    then width option), so the first minimum-waste entry is the greedy choice.
+    """
+    if isinstance(arch, Architecture):
+        return list(arch.candidates(mode_str))
+    candidates: List[Tuple[int, int, int]] = []
+    for ram in arch:
+        capacity_bits = ram["capacity_bits"]
+        if mode_str == "TrueDualPort":
+            width_list = ram.get("width_options_tdp") or []
+        else:
+            width_list = ram.get("width_options") or []
+
+        for phys_width in width_list:
+            if capacity_bits % phys_width != 0:
+                continue
+            candidates.append((ram["type_id"], phys_width, capacity_bits // phys_width))
+    return candidates
+
+
+def fallback_choice(arch: Arch, width: int) -> Assignment:
+    """
+    Returns the (type_id, phys_depth, phys_width, depth_num, width_num) assignment used
+    when no configuration satisfies the series limit: first architecture type, 1x1 blocks.
+    """
+    ram0 = arch[0]
+    capacity_bits = ram0["capacity_bits"]
+    width_list = ram0.get("width_options") or ram0.get("width_options_tdp") or [width]
+    phys_width = min(width_list)
+    if capacity_bits % phys_width == 0:
+        phys_depth = capacity_bits // phys_width
+    else:
+        phys_depth = max(1, capacity_bits // phys_width)
+    return ram0["type_id"], phys_depth, phys_width, 1, 1
+
+
+def arch_fingerprint(arch: Arch) -> tuple:
+    """
+    Returns a hashable summary of the architecture fields that affect mapping
+    (type id, capacity and width options of each RAM type, in order).
+    """
+    if isinstance(arch, Architecture):
+        return arch.fingerprint
+    return tuple(
+        (ram["type_id"],
+         ram["capacity_bits"],
+         tuple(ram.get("width_options") or ()),
+         tuple(ram.get("width_options_tdp") or ()))
+        for ram in arch
+    )
+
+
+class ShapeCache:
+    """
+    Bounded LRU memo of mapping decisions keyed by logical RAM shape.
+
+    Keys combine the architecture fingerprint, max_series, whether the RAM is
+    TrueDualPort (the only mode distinction the mapper makes) and (Depth, Width),
+    so one cache can be shared across sweep points and architectures.
+
+    hits and misses count LRU lookups only; dedup counts RAMs whose shape repeated
+    an earlier RAM of the same call and reused its decision without a lookup.
+    """
+
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.dedup = 0
+        self._entries: "OrderedDict[tuple, Assignment]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple):
+        choice = self._entries.get(key)
+        if choice is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return choice
+
+    def put(self, key: tuple, choice: Assignment) -> None:
+        self._entries[key] = choice
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "dedup": self.dedup,
+                "entries": len(self._entries)}
+
+
+class MapperStats:
+    """
+    Opt-in instrumentation for the mapper: wall time per stage plus hot-path counters.
+
+    Pass an instance as stats= to run_mapper / run_mapper_batch / the assign functions;
+    with stats=None nothing is timed or counted. Counters cover the shapes actually
+    enumerated in this run (shapes served from a ShapeCache are not re-counted), as
+    the exhaustive search sees them (the "pruned" engine visits fewer width options):
+      items: Logical RAMs mapped.
+      shapes_solved: Distinct shapes whose candidates were enumerated.
+      candidates_evaluated: Width options examined for those shapes.
+      rejected_divisibility: ... skipped because capacity_bits % phys_width != 0.
+      rejected_series: ... skipped because depth_num > max_series.
+      fallback_items: Logical RAMs that got the fallback_choice assignment.
+
+    Which counters each mapping path fills in:
+      engines "python", "pruned", "numpy": all of them ("pruned" reports the
+          exhaustive-search candidate and rejection counts, not the options it visited).
+      IncrementalMapper (mapper= in run_mapper_batch): items only; it rebuilds per-type
+          tables instead of solving shapes, so the shape, candidate, rejection and
+          fallback counters stay 0.
+    """
+
+    COUNTERS = ("items", "shapes_solved", "candidates_evaluated",
+                "rejected_divisibility", "rejected_series", "fallback_items")
+
+    def __init__(self):
+        self.stage_sec: Dict[str, float] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(self.COUNTERS, 0)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the enclosed block and adds it to stage_sec[name].
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_sec[name] = self.stage_sec.get(name, 0.0) + time.perf_counter() - start
+
+    def record_shapes(self,
+                      arch: Arch,
+                      max_series: int,
+                      solved: Iterable[tuple],
+                      shape_counts: Dict[tuple, int]) -> None:
+        """
+        Counts candidates for the (tdp, Depth, Width) shapes in solved, and fallback
+        items over every shape in shape_counts (shape -> number of items).
+        """
+        counters = self.counters
+        counters["items"] += sum(shape_counts.values())
+        solved = set(solved)
+        for shape, count in shape_counts.items():
+            tdp, depth, width = shape
+            evaluated = rej_div = rej_series = 0
+            for ram in arch:
+                capacity_bits = ram["capacity_bits"]
+                width_list = ram.get("width_options_tdp" if tdp else "width_options") or []
+                for phys_width in width_list:
+                    evaluated += 1
+                    if capacity_bits % phys_width != 0:
+                        rej_div += 1
+                    elif -(-depth // (capacity_bits // phys_width)) > max_series:
+                        rej_series += 1
+            if shape in solved:
+                counters["shapes_solved"] += 1
+                counters["candidates_evaluated"] += evaluated
+                counters["rejected_divisibility"] += rej_div
+                counters["rejected_series"] += rej_series
+            if evaluated == rej_div + rej_series:
+                counters["fallback_items"] += count
+
+    def as_dict(self) -> dict:
+        return {"stage_sec": dict(self.stage_sec), "counters": dict(self.counters)}
+
+
+@contextmanager
+def _no_stage(name: str):
+    """
+    Stand-in for MapperStats.stage when instrumentation is off.
+    """
+    yield
+
+
+def shape_counts(items: Items) -> Dict[tuple, int]:
+    """
+    Returns (tdp, Depth, Width) -> number of items, as used by MapperStats.record_shapes.
+    """
+    tdp = MODE_MAP["TrueDualPort"]
+    return Counter(zip((m == tdp for m in item_column(items, "Mode")),
+                       item_column(items, "Depth"), item_column(items, "Width")))
+
+
+def select_config(mode_str: str,
+                  depth: int,
+                  width: int,
+                  arch: Arch,
+                  max_series: int = 16) -> Assignment:
+    """
+    Selects the minimum-waste physical implementation of one logical RAM shape.
+
+    Returns (type_id, phys_depth, phys_width, depth_num, width_num), using
+    fallback_choice when no configuration satisfies max_series.
+    """
+    best_choice = None
+    best_waste = 0
+
+    # Allowed (type, width, depth) configurations for the mode, in type then width
+    # order (precomputed for an Architecture)
+    for type_id, phys_width, phys_depth in mode_candidates(arch, mode_str):
+        # Calculate required blocks in Parallel (width) and Series (depth)
+        width_num = math.ceil(width / phys_width)
+        depth_num = math.ceil(depth / phys_depth)
+
+        # Check constraint: Series depth should not exceed max limit
+        if depth_num > max_series:
+            continue
+
+        total_width = width_num * phys_width
+        total_depth = depth_num * phys_depth
+        total_bits = total_width * total_depth
+        used_bits = depth * width
+        waste_bits = total_bits - used_bits
+
+        # Greedy selection: keep the configuration with minimum waste
+        if best_choice is None or waste_bits < best_waste:
+            best_choice = (type_id, phys_depth, phys_width, depth_num, width_num)
+            best_waste = waste_bits
+
+    if best_choice is None:
+        # Fallback: default to the first architecture type if no valid mapping found
+        return fallback_choice(arch, width)
+    return best_choice
+
+
+def prepare_widths(width_list: Iterable[int], capacity_bits: int) -> Tuple[Tuple[int, ...], bool]:
+    """
+    Returns (width options that divide capacity_bits, in list order; whether they are
+    strictly ascending), the per-type input of pruned_widths.
+    """
+    widths = tuple(w for w in width_list if capacity_bits % w == 0)
+    return widths, all(a < b for a, b in zip(widths, widths[1:]))
+
+
+def pruned_widths(widths: Tuple[int, ...],
+                  ascending: bool,
+                  capacity_bits: int,
+                  depth: int,
+                  width: int,
+                  max_series: int = 16) -> List[int]:
+    """
+    Returns the width options of one RAM type (from prepare_widths) that can be its
+    minimum-waste choice for a depth x width logical RAM, in list order.
+
+    On one type waste is (blocks * capacity_bits - depth * width), so only the block
+    count width_num * depth_num matters:
+      * depth_num <= max_series <=> phys_width <= max_series * capacity_bits // depth,
+        so wider options are never valid.
+      * Options with the same width_num = ceil(width / phys_width) differ only in
+        depth_num, which grows with phys_width; within such a class only an option
+        narrower than every earlier one can win (ties go to the earlier option).
+    With ascending widths each class is found by bisection, so at most one option per
+    distinct width_num (about 2 * sqrt(width)) is visited.
+    """
+    limit = max_series * capacity_bits // depth if depth > 0 else capacity_bits
+    if ascending:
+        keep = []
+        idx = bisect.bisect_right(widths, limit)
+        while idx > 0:
+            # Narrowest option sharing width_num with the widest remaining one
+            width_num = -(-width // widths[idx - 1])
+            idx = bisect.bisect_left(widths, -(-width // width_num), 0, idx)
+            keep.append(widths[idx])
+        keep.reverse()
+        return keep
+
+    keep = []
+    narrowest: Dict[int, int] = {}
+    for phys_width in widths:
+        if phys_width > limit:
+            continue
+        width_num = -(-width // phys_width)
+        if phys_width < narrowest.get(width_num, phys_width + 1):
+            narrowest[width_num] = phys_width
+            keep.append(phys_width)
+    return keep
+
+
+def best_on_type(capacity_bits: int,
+                 widths: Tuple[int, ...],
+                 ascending: bool,
+                 depth: int,
+                 width: int,
+                 max_series: int = 16) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    Returns (waste_bits, phys_depth, phys_width, depth_num, width_num) of the
+    minimum-waste configuration on one RAM type (first minimum in list order),
+    or None when no width option satisfies max_series.
+
+    Only pruned_widths are evaluated, and the scan stops once the block count reaches
+    its lower bound ceil(depth * width / capacity_bits), so the result is the same as
+    trying every width option.
+    """
+    used_bits = depth * width
+    min_blocks = -(-used_bits // capacity_bits)
+    best = None
+    for phys_width in pruned_widths(widths, ascending, capacity_bits, depth, width, max_series):
+        phys_depth = capacity_bits // phys_width
+        width_num = -(-width // phys_width)
+        depth_num = -(-depth // phys_depth)
+        waste_bits = width_num * depth_num * capacity_bits - used_bits
+        if best is None or waste_bits < best[0]:
+            best = (waste_bits, phys_depth, phys_width, depth_num, width_num)
+        if width_num * depth_num == min_blocks:
+            break
+    return best
+
+
+def prepare_arch_widths(arch: Arch) -> List[tuple]:
+    """
+    Returns (type_id, capacity_bits, {tdp: prepare_widths(...)}) per RAM type, computed
+    once per architecture for select_config_pruned.
+    """
+    if isinstance(arch, Architecture):
+        return arch.prepared_widths
+    prepared = []
+    for ram in arch:
+        capacity_bits = ram["capacity_bits"]
+        prepared.append((ram["type_id"], capacity_bits, {
+            False: prepare_widths(ram.get("width_options") or [], capacity_bits),
+            True: prepare_widths(ram.get("width_options_tdp") or [], capacity_bits),
+        }))
+    return prepared
+
+
+def select_config_pruned(mode_str: str,
+                         depth: int,
+                         width: int,
+                         arch: Arch,
+                         max_series: int = 16,
+                         prepared: Optional[List[tuple]] = None) -> Assignment:
+    """
+    Same result as select_config, evaluating only the widths that can be optimal
+    (see best_on_type). RAM types whose smallest possible waste cannot beat the
+    current best are skipped entirely.
+
+    prepared is prepare_arch_widths(arch), reused across calls when given.
+    """
+    if prepared is None:
+        prepared = prepare_arch_widths(arch)
+    tdp = mode_str == "TrueDualPort"
+    used_bits = depth * width
+    best_choice = None
+    best_waste = 0
+
+    for type_id, capacity_bits, per_mode in prepared:
+        if best_choice is not None:
+            # Ties keep the earlier type, so a later type must be strictly better
+            if -(-used_bits // capacity_bits) * capacity_bits - used_bits >= best_waste:
+                continue
+        widths, ascending = per_mode[tdp]
+        best = best_on_type(capacity_bits, widths, ascending, depth, width, max_series)
+        if best is not None and (best_choice is None or best[0] < best_waste):
+            best_choice = (type_id,) + best[1:]
+            best_waste = best[0]
+
+    if best_choice is None:
+        return fallback_choice(arch, width)
+    return best_choice
+
+
+def best_config_per_type(mode_str: str,
+                         depth: int,
+                         width: int,
+                         arch: Arch,
+                         max_series: int = 16) -> Dict[int, Assignment]:
+    """
+    Returns the minimum-waste valid Assignment on each RAM type (type_id -> Assignment).
+
+    Types with no configuration within max_series are omitted.
+    """
+    best: Dict[int, Assignment] = {}
+    best_waste: Dict[int, int] = {}
+    used_bits = depth * width
+    for type_id, phys_width, phys_depth in mode_candidates(arch, mode_str):
+        width_num = -(-width // phys_width)
+        depth_num = -(-depth // phys_depth)
+        if depth_num > max_series:
+            continue
+        waste_bits = width_num * phys_width * depth_num * phys_depth - used_bits
+        if type_id not in best or waste_bits < best_waste[type_id]:
+            best[type_id] = (type_id, phys_depth, phys_width, depth_num, width_num)
+            best_waste[type_id] = waste_bits
+    return best
+
+
+def assign_rams_with_arch(items: Items,
+                          arch: Arch,
+                          max_series: int = 16,
+                          cache: Optional[ShapeCache] = None,
+                          stats: Optional[MapperStats] = None,
+                          prune: bool = False) -> List[Assignment]:
+    """
+    Computes the minimum-waste Assignment of every logical RAM without modifying items.
+
+    Each distinct (mode, Depth, Width) shape is solved once and the result is
+    fanned out to every matching item.
+
     Parameters:
       items: List of logical RAMs.
       arch: Architecture definition.
       max_series: Maximum allowable blocks in series (default 16).
+      cache: Optional ShapeCache reused across calls (e.g. sweep points).
+      stats: Optional MapperStats to record candidate counters into.
+      prune: Evaluate only the width options that can be optimal (select_config_pruned);
+             the result is identical, and faster for types with many width options.
     """
-    for item in items:
-        mode_str = item["ModeStr"]
-        depth = item["Depth"]
-        width = item["Width"]
-
-        best_choice = None
+    if prune:
+        prepared = prepare_arch_widths(arch)
+        select = functools.partial(select_config_pruned, prepared=prepared)
+    else:
+        select = select_config
+    fingerprint = (arch_fingerprint(arch), max_series)
+    local: Dict[tuple, Assignment] = {}
+    solved: List[tuple] = []
+    assignments: List[Assignment] = []
+    tdp = MODE_MAP["TrueDualPort"]
+
+    for mode, depth, width in zip(item_column(items, "Mode"),
+                                  item_column(items, "Depth"),
+                                  item_column(items, "Width")):
+        shape = (mode == tdp, depth, width)
+
+        choice = local.get(shape)
+        if choice is None:
+            key = (fingerprint, shape)
+            choice = cache.get(key) if cache is not None else None
+            if choice is None:
+                choice = select(MODE_REVERSE[mode], depth, width, arch, max_series)
+                solved.append(shape)
+                if cache is not None:
+                    cache.put(key, choice)
+            local[shape] = choice
+        elif cache is not None:
+            cache.dedup += 1
+
+        assignments.append(choice)
+
+    if stats is not None:
+        stats.record_shapes(arch, max_series, solved, shape_counts(items))
+    return assignments
+
+
+def select_config_series(mode_str: str,
+                         depth: int,
+                         width: int,
+                         arch: Arch,
+                         limits: Iterable[int]) -> Dict[int, Assignment]:
+    """
+    select_config for several max_series values in one pass over the candidates.
 
-        for ram in arch:
-            type_id = ram["type_id"]
-            capacity_bits = ram["capacity_bits"]
+    Keeps the minimum-waste candidate of every series-count bucket (the first in
+    candidate order on ties, as select_config does). The choice under a limit L is
+    the best bucket with depth_num <= L, so a running minimum over the buckets in
+    depth_num order answers every limit. Returns max_series -> Assignment
+    (fallback_choice for limits no configuration satisfies).
+    """
+    # depth_num -> (waste_bits, candidate order, Assignment)
+    buckets: Dict[int, tuple] = {}
+    used_bits = depth * width
+    for order, (type_id, phys_width, phys_depth) in enumerate(mode_candidates(arch, mode_str)):
+        width_num = math.ceil(width / phys_width)
+        depth_num = math.ceil(depth / phys_depth)
+        waste_bits = width_num * phys_width * depth_num * phys_depth - used_bits
+        best = buckets.get(depth_num)
+        if best is None or waste_bits < best[0]:
+            buckets[depth_num] = (waste_bits, order,
+                                  (type_id, phys_depth, phys_width, depth_num, width_num))
+
+    choices: Dict[int, Assignment] = {}
+    ordered = sorted(buckets.items())
+    running = None
+    idx = 0
+    for limit in sorted(set(limits)):
+        while idx < len(ordered) and ordered[idx][0] <= limit:
+            candidate = ordered[idx][1]
+            if running is None or candidate[:2] < running[:2]:
+                running = candidate
+            idx += 1
+        choices[limit] = running[2] if running is not None else fallback_choice(arch, width)
+    return choices
+
+
+def assign_rams_series(items: Items,
+                       arch: Arch,
+                       limits: Iterable[int]) -> Dict[int, List[Assignment]]:
+    """
+    Computes the minimum-waste Assignments of every logical RAM for several
+    max_series values at once: max_series -> Assignment per item, each identical to
+    assign_rams_with_arch(items, arch, max_series). Every distinct shape is
+    enumerated once for all limits (select_config_series).
+    """
+    limits = sorted(set(limits))
+    local: Dict[tuple, tuple] = {}
+    columns: Dict[int, List[Assignment]] = {limit: [] for limit in limits}
+    appends = [columns[limit].append for limit in limits]
+    tdp = MODE_MAP["TrueDualPort"]
+
+    for mode, depth, width in zip(item_column(items, "Mode"),
+                                  item_column(items, "Depth"),
+                                  item_column(items, "Width")):
+        shape = (mode == tdp, depth, width)
+        choices = local.get(shape)
+        if choices is None:
+            by_limit = select_config_series(MODE_REVERSE[mode], depth, width, arch, limits)
+            choices = local[shape] = tuple(by_limit[limit] for limit in limits)
+        for append, choice in zip(appends, choices):
+            append(choice)
+    return columns
+
+
+class IncrementalMapper:
+    """
+    Minimum-waste mapper that keeps per-shape, per-RAM-type best configurations
+    between calls, for walking a sweep of closely related architectures.
+
+    A RAM type's best configuration for a shape depends only on its type signature
+    (capacity_bits, width_options, width_options_tdp) and max_series, so:
+      * Points that differ only in area parameters (lb_per_bram, ...) reuse the
+        previous assignments without remapping.
+      * When one RAM type changes, only that type's per-shape table is recomputed;
+        the per-shape winners of the other types are kept.
+    Results are identical to assign_rams_with_arch (ties go to the earlier RAM type,
+    then the earlier width option).
+
+    Bound to one parsed input (items must not change between calls).
+    """
 
-            # Select allowed width options based on mode
-            if mode_str == "TrueDualPort":
-                width_list = ram.get("width_options_tdp") or []
+    # Types with more usable width options than this are solved with best_on_type
+    PRUNE_MIN_WIDTHS = 16
+
+    def __init__(self, items: Items, max_tables: int = 64):
+        self.items = items
+        self.max_tables = max_tables
+        self.tables_built = 0
+        self.remaps = 0
+
+        # Distinct (tdp, Depth, Width) shapes and the shape index of every item
+        tdp = MODE_MAP["TrueDualPort"]
+        index: Dict[tuple, int] = {}
+        self._inverse = array("i")
+        for mode, depth, width in zip(item_column(items, "Mode"),
+                                      item_column(items, "Depth"),
+                                      item_column(items, "Width")):
+            shape = (mode == tdp, depth, width)
+            idx = index.get(shape)
+            if idx is None:
+                idx = index[shape] = len(index)
+            self._inverse.append(idx)
+        self._shapes = list(index)
+
+        # Type signature -> per-shape (waste, phys_depth, phys_width, depth_num, width_num) or None
+        self._tables: "OrderedDict[tuple, list]" = OrderedDict()
+        # Last architecture key and its result
+        self._last_key: Optional[tuple] = None
+        self._last_winners: List[Optional[tuple]] = []
+        self._last_assignments: List[Assignment] = []
+
+    @staticmethod
+    def type_signature(ram: dict, max_series: int) -> tuple:
+        """
+        The fields of one RAM type that affect its mapping decisions.
+        """
+        return (ram["capacity_bits"],
+                tuple(ram.get("width_options") or ()),
+                tuple(ram.get("width_options_tdp") or ()),
+                max_series)
+
+    def _type_table(self, signature: tuple) -> list:
+        table = self._tables.get(signature)
+        if table is not None:
+            self._tables.move_to_end(signature)
+            return table
+
+        capacity_bits, widths, widths_tdp, max_series = signature
+        per_mode = {False: prepare_widths(widths, capacity_bits),
+                    True: prepare_widths(widths_tdp, capacity_bits)}
+        if max(len(per_mode[False][0]), len(per_mode[True][0])) > self.PRUNE_MIN_WIDTHS:
+            table = [best_on_type(capacity_bits, *per_mode[tdp], depth, width, max_series)
+                     for tdp, depth, width in self._shapes]
+        else:
+            # Short width lists: a plain scan is cheaper than pruning them
+            table = []
+            for tdp, depth, width in self._shapes:
+                best = None
+                used_bits = depth * width
+                for phys_width in per_mode[tdp][0]:
+                    phys_depth = capacity_bits // phys_width
+                    depth_num = -(-depth // phys_depth)
+                    if depth_num > max_series:
+                        continue
+                    width_num = -(-width // phys_width)
+                    waste_bits = width_num * depth_num * capacity_bits - used_bits
+                    if best is None or waste_bits < best[0]:
+                        best = (waste_bits, phys_depth, phys_width, depth_num, width_num)
+                table.append(best)
+
+        self.tables_built += 1
+        self._tables[signature] = table
+        if len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def assign(self,
+               arch: Arch,
+               max_series: int = 16,
+               stats: Optional[MapperStats] = None) -> List[Assignment]:
+        """
+        Returns the minimum-waste Assignment of every item on arch.
+        """
+        signatures = [self.type_signature(ram, max_series) for ram in arch]
+        key = tuple(zip((ram["type_id"] for ram in arch), signatures))
+        if stats is not None:
+            stats.counters["items"] += len(self._inverse)
+        if key == self._last_key:
+            return list(self._last_assignments)
+
+        # Positions whose type changed since the last call (all of them if the
+        # number of types differs)
+        last = self._last_key
+        if last is not None and len(last) == len(key):
+            changed = [t for t in range(len(key)) if key[t] != last[t]]
+        else:
+            changed = None
+
+        tables = [self._type_table(sig) for sig in signatures]
+        type_ids = [ram["type_id"] for ram in arch]
+
+        # Winner per shape: (waste, type index) of the first minimum in type order
+        if changed is None:
+            winners = []
+            for s in range(len(self._shapes)):
+                best = None
+                for t, table in enumerate(tables):
+                    entry = table[s]
+                    if entry is not None and (best is None or entry[0] < best[0]):
+                        best = (entry[0], t)
+                winners.append(best)
+        else:
+            winners = list(self._last_winners)
+            for s, best in enumerate(winners):
+                if best is not None and best[1] in changed:
+                    # The previous winner itself changed: re-select over all types
+                    best = None
+                    for t, table in enumerate(tables):
+                        entry = table[s]
+                        if entry is not None and (best is None or entry[0] < best[0]):
+                            best = (entry[0], t)
+                else:
+                    # Only the changed types can displace the previous winner
+                    for t in changed:
+                        entry = tables[t][s]
+                        if entry is None:
+                            continue
+                        if (best is None or entry[0] < best[0]
+                                or (entry[0] == best[0] and t < best[1])):
+                            best = (entry[0], t)
+                winners[s] = best
+
+        per_shape: List[Assignment] = []
+        for s, ((_, _, width), best) in enumerate(zip(self._shapes, winners)):
+            if best is None:
+                per_shape.append(fallback_choice(arch, width))
             else:
-                width_list = ram.get("width_options") or []
+                t = best[1]
+                per_shape.append((type_ids[t],) + tables[t][s][1:])
+
+        assignments = [per_shape[s] for s in self._inverse]
+        self.remaps += 1
+        self._last_key = key
+        self._last_winners = winners
+        self._last_assignments = assignments
+        return list(assignments)
 
-            if not width_list:
-                continue
 
-            for phys_width in width_list:
-                # Ensure capacity is divisible by width for integer depth
-                if capacity_bits % phys_width != 0:
-                    continue
-                phys_depth = capacity_bits // phys_width
+def apply_assignments(items: Items, assignments: List[Assignment]) -> None:
+    """
+    Writes Assignments into the mapping fields of the items.
+    """
+    if isinstance(items, RamTable):
+        for name, values in zip(RamTable.OUTPUT_COLUMNS, zip(*assignments)):
+            setattr(items, name, array("i", values))
+        items.ensure_outputs()
+        return
+
+    for item, choice in zip(items, assignments):
+        (item["RAM_type"], item["small_depthchoose"], item["small_widthchoose"],
+         item["small_depthnum"], item["small_widthnum"]) = choice
+
+
+def map_rams_with_arch(items: Items,
+                       arch: Arch,
+                       max_series: int = 16,
+                       cache: Optional[ShapeCache] = None,
+                       stats: Optional[MapperStats] = None,
+                       prune: bool = False) -> None:
+    """
+    Selects the physical RAM implementation that minimizes bit waste for each logical RAM
+    and stores it in the item dicts (see assign_rams_with_arch).
+    """
+    apply_assignments(items, assign_rams_with_arch(items, arch, max_series, cache, stats, prune))
 
-                # Calculate required blocks in Parallel (width) and Series (depth)
-                width_num = math.ceil(width / phys_width)
-                depth_num = math.ceil(depth / phys_depth)
 
-                # Check constraint: Series depth should not exceed max limit
-                if depth_num > max_series:
-                    continue
+# ------------------------- Depth Splitting -------------------------
+#
+# A logical RAM may also be split in depth across several physical groups, e.g. a
+# chain of large BRAMs for most of the words plus a LUTRAM array for the tail. Every
+# group is an ordinary series x parallel array at the full logical width; together the
+# groups form one series chain behind a single decoder and read MUX.
+#
+# The checker's mapping format has no way to describe such a RAM, so depth splitting
+# is an analysis only: split assignments are scored in-process (compute_overhead_luts,
+# area_model.evaluate_area, split_report.py) and never written as mapping lines.
 
-                total_width = width_num * phys_width
-                total_depth = depth_num * phys_depth
-                total_bits = total_width * total_depth
-                used_bits = depth * width
-                waste_bits = total_bits - used_bits
-
-                # Greedy selection: keep the configuration with minimum waste
-                if best_choice is None or waste_bits < best_choice["waste_bits"]:
-                    best_choice = {
-                        "type_id": type_id,
-                        "phys_width": phys_width,
-                        "phys_depth": phys_depth,
-                        "width_num": width_num,
-                        "depth_num": depth_num,
-                        "waste_bits": waste_bits,
-                    }
-
-        # Apply the best choice found
-        if best_choice is None:
-            # Fallback: default to the first architecture type if no valid mapping found
-            ram0 = arch[0]
-            type_id = ram0["type_id"]
-            capacity_bits = ram0["capacity_bits"]
-            width_list = ram0.get("width_options") or ram0.get("width_options_tdp") or [width]
-            phys_width = min(width_list)
-            if capacity_bits % phys_width == 0:
-                phys_depth = capacity_bits // phys_width
-            else:
-                phys_depth = max(1, capacity_bits // phys_width)
+# Default maximum number of groups of one split logical RAM
+MAX_SPLIT_GROUPS = 2
 
-            item["RAM_type"] = type_id
-            item["small_depthchoose"] = phys_depth
-            item["small_widthchoose"] = phys_width
-            item["small_depthnum"] = 1
-            item["small_widthnum"] = 1
-        else:
-            item["RAM_type"] = best_choice["type_id"]
-            item["small_depthchoose"] = best_choice["phys_depth"]
-            item["small_widthchoose"] = best_choice["phys_width"]
-            item["small_depthnum"] = best_choice["depth_num"]
-            item["small_widthnum"] = best_choice["width_num"]
+
+class SplitAssignment(tuple):
+    """
+    Mapping decision for one logical RAM split in depth: one
+    (type_id, phys_depth, phys_width, depth_num, width_num, group_depth) tuple per
+    group, in address order, where group_depth is the number of logical words the
+    group implements.
+    """
+    __slots__ = ()
+
+    @property
+    def series(self) -> int:
+        """Total blocks in series over all groups (decoder / MUX inputs)."""
+        return sum(group[3] for group in self)
+
+
+def series_count(choice) -> int:
+    """
+    Returns the number of blocks in series of an Assignment or SplitAssignment.
+    """
+    if isinstance(choice, SplitAssignment):
+        return choice.series
+    return choice[3]
+
+
+def select_split_config(mode_str: str,
+                        depth: int,
+                        width: int,
+                        arch: Arch,
+                        max_series: int = 16,
+                        max_groups: int = MAX_SPLIT_GROUPS) -> Union[Assignment, SplitAssignment]:
+    """
+    Selects the minimum-waste implementation of one logical RAM shape when its depth
+    may be split across up to max_groups physical groups.
+
+    best(rest, series, groups) is the cheapest way to implement the last `rest` words
+    with at most `series` blocks in series and `groups` groups: the next group either
+    finishes the RAM (ceil(rest / D) blocks deep) or takes s * D < rest words and
+    leaves the remainder to the following groups. The DP is memoized on its state,
+    skips configurations dominated by one at least as deep with no more bits per
+    block, and stops extending a group once it cannot beat the best option found so
+    far. Ties prefer fewer groups, then fewer series blocks.
+
+    Returns select_config's Assignment unless a split wastes strictly fewer bits,
+    in which case a SplitAssignment.
+    """
+    single = select_config(mode_str, depth, width, arch, max_series)
+    single_bits = single[1] * single[2] * single[3] * single[4]
+    if max_groups < 2 or single_bits == depth * width:
+        return single
+
+    # (type_id, phys_width, phys_depth, width_num, bits per series step), deepest first
+    options = []
+    for type_id, phys_width, phys_depth in mode_candidates(arch, mode_str):
+        width_num = math.ceil(width / phys_width)
+        options.append((type_id, phys_width, phys_depth, width_num,
+                        phys_width * phys_depth * width_num))
+    options.sort(key=lambda option: (-option[2], option[4]))
+    pareto = []
+    for option in options:
+        if not pareto or option[4] < pareto[-1][4]:
+            pareto.append(option)
+
+    def finish(rest: int, series_left: int) -> Optional[tuple]:
+        # Cheapest single group implementing the last rest words: (bits, series, option)
+        result = None
+        for option in pareto:
+            depth_num = -(-rest // option[2])
+            if depth_num > series_left:
+                break  # shallower options need even more blocks in series
+            bits = depth_num * option[4]
+            if result is None or bits < result[0] or (bits == result[0] and depth_num < result[1]):
+                result = (bits, depth_num, option)
+        return result
+
+    memo: Dict[tuple, Optional[tuple]] = {}
+
+    def best(rest: int, series_left: int, groups_left: int) -> Optional[tuple]:
+        # (allocated bits, groups, series blocks, groups tuple), or None if nothing fits
+        key = (rest, series_left, groups_left)
+        if key in memo:
+            return memo[key]
+        last = finish(rest, series_left)
+        if last is None:
+            memo[key] = None
+            return None
+        bits, depth_num, (type_id, phys_width, phys_depth, width_num, _) = last
+        result = (bits, 1, depth_num,
+                  ((type_id, phys_depth, phys_width, depth_num, width_num, rest),))
+
+        # s blocks in series taking s * D < rest words, the rest left to the next groups
+        if groups_left > 1:
+            for type_id, phys_width, phys_depth, width_num, block_bits in pareto:
+                for depth_num in range(1, min(-(-rest // phys_depth), series_left)):
+                    bits = depth_num * block_bits
+                    tail_depth = rest - depth_num * phys_depth
+                    # Lower bound: the remaining words without waste (non-decreasing in s)
+                    if bits + tail_depth * width >= result[0]:
+                        break
+                    if groups_left == 2:
+                        # Last group inline (most splits), rather than a memoized state
+                        tail = finish(tail_depth, series_left - depth_num)
+                        if tail is None or bits + tail[0] > result[0]:
+                            continue
+                        tail_option = tail[2]
+                        tail = (tail[0], 1, tail[1],
+                                ((tail_option[0], tail_option[2], tail_option[1], tail[1],
+                                  tail_option[3], tail_depth),))
+                    else:
+                        tail = best(tail_depth, series_left - depth_num, groups_left - 1)
+                        if tail is None:
+                            continue
+                    option = (bits + tail[0], 1 + tail[1], depth_num + tail[2],
+                              ((type_id, phys_depth, phys_width, depth_num, width_num,
+                                depth_num * phys_depth),) + tail[3])
+                    if option < result:
+                        result = option
+        memo[key] = result
+        return result
+
+    # No split fits either when no single configuration does (fallback_choice)
+    split = best(depth, max_series, max_groups)
+    if split is None or split[0] >= single_bits:
+        return single
+    return SplitAssignment(split[3])
+
+
+def assign_rams_split(items: Items,
+                      arch: Arch,
+                      max_series: int = 16,
+                      cache: Optional[ShapeCache] = None,
+                      max_groups: int = MAX_SPLIT_GROUPS) -> list:
+    """
+    Computes the minimum-waste mapping of every logical RAM allowing depth splits
+    (select_split_config): an Assignment or a SplitAssignment per item. Each distinct
+    shape is solved once, as in assign_rams_with_arch.
+    """
+    fingerprint = (arch_fingerprint(arch), max_series, "split", max_groups)
+    local: Dict[tuple, tuple] = {}
+    assignments: list = []
+    tdp = MODE_MAP["TrueDualPort"]
+
+    for mode, depth, width in zip(item_column(items, "Mode"),
+                                  item_column(items, "Depth"),
+                                  item_column(items, "Width")):
+        shape = (mode == tdp, depth, width)
+
+        choice = local.get(shape)
+        if choice is None:
+            key = (fingerprint, shape)
+            choice = cache.get(key) if cache is not None else None
+            if choice is None:
+                choice = select_split_config(MODE_REVERSE[mode], depth, width, arch,
+                                             max_series, max_groups)
+                if cache is not None:
+                    cache.put(key, choice)
+            local[shape] = choice
+        elif cache is not None:
+            cache.dedup += 1
+
+        assignments.append(choice)
+    return assignments
 
 
 # ------------------------- Overhead Calculation -------------------------
 
-def compute_overhead_luts(items: List[dict]) -> Tuple[List[int], List[int], List[int]]:
+def series_overhead_luts(dnum: Optional[int], width: int, mode_str: str) -> Tuple[int, int]:
+    """
+    Returns the (decoder, mux) LUTs of one logical RAM with dnum blocks in series
+    (see compute_overhead_luts for the rules).
+    """
+    if dnum is None or dnum <= 1:
+        decoder = 0
+        mux = 0
+    else:
+        # 1) Decoder logic
+        if dnum == 2:
+            decoder = 1
+        else:
+            decoder = dnum
+
+        # 2) MUX logic (cascaded 4:1 LUTs)
+        if dnum <= 4:
+            mux = width
+        else:
+            mux_levels = dnum // 4 + 1
+            mux = mux_levels * width
+
+    if mode_str == "TrueDualPort":
+        decoder *= 2
+        mux *= 2
+
+    return decoder, mux
+
+
+def compute_overhead_luts(items: Items,
+                          assignments: Optional[List[Assignment]] = None
+                          ) -> Tuple[List[int], List[int], List[int]]:
     """
     Calculates overhead LUTs required for decoding and multiplexing.
     
@@ -361,37 +1655,21 @@ def compute_overhead_luts(items: List[dict]) -> Tuple[List[int], List[int], List
       * Series R blocks requires R:1 decoder.
       * Reading requires W * R:1 MUX (implemented via 4:1 LUTs).
       * TrueDualPort doubles the overhead requirements.
+      * A SplitAssignment counts the series blocks of all its groups as one chain.
+
+    If assignments is given, series counts are taken from it instead of the items.
     """
     overhead_list: List[int] = []
     decoder_list: List[int] = []
     mux_list: List[int] = []
 
-    for item in items:
-        dnum = item["small_depthnum"]  # Series count R
-        width = item["Width"]          # Logical Width W
-        mode_str = item["ModeStr"]
-
-        if dnum is None or dnum <= 1:
-            decoder = 0
-            mux = 0
-        else:
-            # 1) Decoder logic
-            if dnum == 2:
-                decoder = 1
-            else:
-                decoder = dnum
-
-            # 2) MUX logic (cascaded 4:1 LUTs)
-            if dnum <= 4:
-                mux = width
-            else:
-                mux_levels = dnum // 4 + 1
-                mux = mux_levels * width
-
-        if mode_str == "TrueDualPort":
-            decoder *= 2
-            mux *= 2
+    if assignments is None:
+        dnums = item_column(items, "small_depthnum")  # Series count R
+    else:
+        dnums = [series_count(choice) for choice in assignments]
 
+    for dnum, width, mode in zip(dnums, item_column(items, "Width"), item_column(items, "Mode")):
+        decoder, mux = series_overhead_luts(dnum, width, MODE_REVERSE[mode])
         overhead = decoder + mux
         overhead_list.append(overhead)
         decoder_list.append(decoder)
@@ -402,8 +1680,31 @@ def compute_overhead_luts(items: List[dict]) -> Tuple[List[int], List[int], List
 
 # ------------------------- Output Generation -------------------------
 
-def generate_mapping_lines(items: List[dict],
-                           overhead_luts: List[int]) -> List[str]:
+def format_mapping_line(circuit: int, ramid: int, extra_luts: int,
+                        logical_width: int, logical_depth: int,
+                        group_id: int, series: Optional[int], parallel: Optional[int],
+                        ram_type: int, mode_str: str,
+                        phys_width: int, phys_depth: int) -> str:
+    """
+    Formats one mapping line in checker format (see generate_mapping_lines).
+    """
+    if series is None or series <= 0:
+        series = 1
+    if parallel is None or parallel <= 0:
+        parallel = 1
+
+    return (
+        f"{circuit} {ramid} {extra_luts} "
+        f"LW {logical_width} LD {logical_depth} "
+        f"ID {group_id} S {series} P {parallel} "
+        f"Type {ram_type} Mode {mode_str} "
+        f"W {phys_width} D {phys_depth}"
+    )
+
+
+def generate_mapping_lines(items: Items,
+                           overhead_luts: List[int],
+                           assignments: Optional[List[Assignment]] = None) -> List[str]:
     """
     Generates the formatted text lines required by the checker.
     Format:
@@ -411,59 +1712,286 @@ def generate_mapping_lines(items: List[dict],
       LW <logical_width> LD <logical_depth>
       ID <group_id> S <series> P <parallel>
       Type <type> Mode <mode_str> W <phys_width> D <phys_depth>
+
+    If assignments is given, the physical mapping is taken from it instead of the items.
     """
     lines: List[str] = []
     next_group_id = 0
 
-    for item, extra_luts in zip(items, overhead_luts):
-        circuit = item["Circuit"]
-        ramid = item["RamID"]
-        logical_width = item["Width"]
-        logical_depth = item["Depth"]
-        mode_str = item["ModeStr"]
-        ram_type = item["RAM_type"]
-        phys_width = item["small_widthchoose"]
-        phys_depth = item["small_depthchoose"]
-        series = item["small_depthnum"]
-        parallel = item["small_widthnum"]
+    if assignments is None:
+        assignments = zip(*(item_column(items, name) for name in RamTable.OUTPUT_COLUMNS))
 
-        if series is None or series <= 0:
-            series = 1
-        if parallel is None or parallel <= 0:
-            parallel = 1
+    for circuit, ramid, logical_width, logical_depth, mode, extra_luts, choice in zip(
+            item_column(items, "Circuit"), item_column(items, "RamID"),
+            item_column(items, "Width"), item_column(items, "Depth"),
+            item_column(items, "Mode"), overhead_luts, assignments):
+        ram_type, phys_depth, phys_width, series, parallel = choice
 
         group_id = next_group_id
         next_group_id += 1
 
-        line = (
-            f"{circuit} {ramid} {extra_luts} "
-            f"LW {logical_width} LD {logical_depth} "
-            f"ID {group_id} S {series} P {parallel} "
-            f"Type {ram_type} Mode {mode_str} "
-            f"W {phys_width} D {phys_depth}"
-        )
-        lines.append(line)
+        lines.append(format_mapping_line(circuit, ramid, extra_luts, logical_width, logical_depth,
+                                         group_id, series, parallel, ram_type, MODE_REVERSE[mode],
+                                         phys_width, phys_depth))
 
     return lines
 
 
+# ------------------------- Streaming Pipeline -------------------------
+#
+# parse -> map -> overhead -> format -> buffered write, one logical RAM at a time,
+# so peak memory does not grow with the size of the input. Only the per-RAM
+# minimum-waste objective can be streamed (area-driven mapping needs whole circuits).
+
+def iter_assignments(items: Iterable[dict],
+                     arch: Arch,
+                     max_series: int = 16,
+                     cache: Optional[ShapeCache] = None) -> Iterator[Tuple[dict, Assignment]]:
+    """
+    Streams (item, Assignment) pairs. Decisions are memoized in a bounded ShapeCache
+    (a fresh one if none is given), so memory stays flat for any number of shapes.
+    """
+    if cache is None:
+        cache = ShapeCache()
+    fingerprint = (arch_fingerprint(arch), max_series)
+
+    for item in items:
+        mode_str = item["ModeStr"]
+        key = (fingerprint, (mode_str == "TrueDualPort", item["Depth"], item["Width"]))
+        choice = cache.get(key)
+        if choice is None:
+            choice = select_config(mode_str, item["Depth"], item["Width"], arch, max_series)
+            cache.put(key, choice)
+        yield item, choice
+
+
+def iter_overhead_luts(pairs: Iterable[Tuple[dict, Assignment]]
+                       ) -> Iterator[Tuple[dict, Assignment, int]]:
+    """
+    Streams (item, Assignment, overhead LUTs) triples.
+    """
+    for item, choice in pairs:
+        decoder, mux = series_overhead_luts(choice[3], item["Width"], item["ModeStr"])
+        yield item, choice, decoder + mux
+
+
+def iter_mapping_lines(triples: Iterable[Tuple[dict, Assignment, int]]) -> Iterator[str]:
+    """
+    Streams checker-format mapping lines, numbering groups in input order.
+    """
+    for group_id, (item, choice, extra_luts) in enumerate(triples):
+        ram_type, phys_depth, phys_width, series, parallel = choice
+        yield format_mapping_line(item["Circuit"], item["RamID"], extra_luts,
+                                  item["Width"], item["Depth"], group_id, series, parallel,
+                                  ram_type, item["ModeStr"], phys_width, phys_depth)
+
+
+def write_lines(lines: Iterable[str], out: TextIO, batch_size: int = 4096) -> int:
+    """
+    Writes lines to an open text file in batches; returns the number of lines written.
+    """
+    lines = iter(lines)
+    count = 0
+    for batch in iter(lambda: list(itertools.islice(lines, batch_size)), []):
+        out.write("\n".join(batch))
+        out.write("\n")
+        count += len(batch)
+    return count
+
+
+def stream_mapper(logical_rams_path: str,
+                  arch: Arch,
+                  out: TextIO,
+                  max_series: int = 16,
+                  cache: Optional[ShapeCache] = None) -> int:
+    """
+    Maps logical_rams_path to out without holding the input or output in memory.
+    Produces the same lines as run_mapper; returns the number of lines written.
+    """
+    items = iter_logical_rams(logical_rams_path)
+    lines = iter_mapping_lines(iter_overhead_luts(iter_assignments(items, arch, max_series, cache)))
+    return write_lines(lines, out)
+
+
 # ------------------------- Main Interface -------------------------
 
+ENGINES = ("python", "pruned", "numpy")
+
+
+def get_map_function(engine: str = "python"):
+    """
+    Returns the in-place mapping function for the requested engine.
+
+    "pruned" is the pure-Python greedy evaluating only the width options that can be
+    optimal (same result, see select_config_pruned).
+    "numpy" selects the vectorized engine (ram_mapper_numpy) and silently falls back
+    to the pure-Python greedy when NumPy is not installed.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown mapping engine '{engine}', expected one of {ENGINES}")
+    if engine == "pruned":
+        return functools.partial(map_rams_with_arch, prune=True)
+    if engine == "numpy":
+        try:
+            from ram_mapper_numpy import map_rams_with_arch_numpy
+            return map_rams_with_arch_numpy
+        except ImportError:
+            pass
+    return map_rams_with_arch
+
+
+def get_assign_function(engine: str = "python"):
+    """
+    Returns the non-mutating assignment function for the requested engine
+    (same engine selection and fallback as get_map_function).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown mapping engine '{engine}', expected one of {ENGINES}")
+    if engine == "pruned":
+        return functools.partial(assign_rams_with_arch, prune=True)
+    if engine == "numpy":
+        try:
+            from ram_mapper_numpy import assign_rams_with_arch_numpy
+            return assign_rams_with_arch_numpy
+        except ImportError:
+            pass
+    return assign_rams_with_arch
+
+
+def get_overhead_function(engine: str = "python"):
+    """
+    Returns the overhead LUT function for the requested engine. Both return
+    (overhead, decoder, mux, ...) with one entry per item; "numpy" returns int64
+    arrays (ram_mapper_numpy.compute_overhead_luts_numpy) and falls back to
+    compute_overhead_luts when NumPy is not installed.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown mapping engine '{engine}', expected one of {ENGINES}")
+    if engine == "numpy":
+        try:
+            from ram_mapper_numpy import compute_overhead_luts_numpy
+            return compute_overhead_luts_numpy
+        except ImportError:
+            pass
+    return compute_overhead_luts
+
+
+OBJECTIVES = ("waste", "area", "exact")
+# Seconds of search per circuit of objective "exact" (exact_mapper.py)
+DEFAULT_EXACT_BUDGET = 1.0
+
+
+def run_mapper_batch(items: Items,
+                     archs: List[List[dict]],
+                     max_series: int = 16,
+                     engine: str = "python",
+                     cache: Optional[ShapeCache] = None,
+                     objective: str = "waste",
+                     logic_block_counts: Optional[Dict[int, int]] = None,
+                     stats: Optional[MapperStats] = None,
+                     mapper: Optional[IncrementalMapper] = None,
+                     exact_budget: Optional[float] = None,
+                     exact_workers: Optional[int] = None) -> List[dict]:
+    """
+    Maps one parsed input against many architectures (parse once, map many).
+
+    items are never modified, so the same parsed list can be reused freely.
+    objective "waste" keeps the per-RAM minimum-waste greedy; "area" refines it to
+    reduce each circuit's tile count (area_mapper.py, needs logic_block_counts);
+    "exact" searches each circuit for its minimum tile count by branch-and-bound,
+    within a time budget per circuit (exact_mapper.py, needs logic_block_counts);
+    exact_budget (seconds of search per circuit, None = DEFAULT_EXACT_BUDGET)
+    and exact_workers (processes solving circuits in parallel, None = one per CPU
+    core) only apply to "exact".
+    stats (optional MapperStats) accumulates stage times ("map", "area_opt",
+    "exact_opt", "overhead", "format") and candidate counters over all architectures.
+    mapper (optional IncrementalMapper built on items) replaces the engine for the
+    minimum-waste step and only remaps what changed since its previous architecture.
+    Returns one result dict per architecture, in order:
+      arch: The architecture definition.
+      assignments: Assignment per item.
+      overhead_luts: Additional LUTs per item (an int64 array with the numpy engine).
+      lines: Mapping lines in checker format.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown mapping objective '{objective}', expected one of {OBJECTIVES}")
+    if objective in ("area", "exact") and logic_block_counts is None:
+        raise ValueError(f"objective='{objective}' requires logic_block_counts")
+    if objective == "area":
+        from area_mapper import optimize_area_mapping
+    elif objective == "exact":
+        from exact_mapper import optimize_exact_mapping
+    if mapper is not None and mapper.items is not items:
+        raise ValueError("mapper was built on a different items object")
+
+    assign_fn = get_assign_function(engine)
+    overhead_fn = get_overhead_function(engine)
+    stage = stats.stage if stats is not None else _no_stage
+    results: List[dict] = []
+    for arch in archs:
+        with stage("map"):
+            if mapper is not None:
+                assignments = mapper.assign(arch, max_series=max_series, stats=stats)
+            else:
+                assignments = assign_fn(items, arch, max_series=max_series, cache=cache,
+                                        stats=stats)
+        if objective == "area":
+            with stage("area_opt"):
+                assignments = optimize_area_mapping(items, assignments, logic_block_counts,
+                                                    arch, max_series=max_series)
+        elif objective == "exact":
+            with stage("exact_opt"):
+                assignments = optimize_exact_mapping(
+                    items, assignments, logic_block_counts, arch, max_series=max_series,
+                    budget=DEFAULT_EXACT_BUDGET if exact_budget is None else exact_budget,
+                    workers=exact_workers)
+        with stage("overhead"):
+            overhead_luts = overhead_fn(items, assignments)[0]
+        with stage("format"):
+            lines = generate_mapping_lines(items, overhead_luts, assignments)
+        results.append({
+            "arch": arch,
+            "assignments": assignments,
+            "overhead_luts": overhead_luts,
+            "lines": lines,
+        })
+    return results
+
+
 def run_mapper(logical_rams_path: str,
                logic_block_count_path: str,
-               arch: List[dict],
-               max_series: int = 16) -> List[str]:
+               arch: Arch,
+               max_series: int = 16,
+               engine: str = "python",
+               cache: Optional[ShapeCache] = None,
+               objective: str = "waste",
+               stats: Optional[MapperStats] = None,
+               sidecar: bool = False,
+               exact_budget: Optional[float] = None,
+               exact_workers: Optional[int] = None) -> List[str]:
     """
     Main entry point: processes inputs using the provided architecture and returns mapping lines.
-    """
-    items = parse_logical_rams(logical_rams_path)
-    # Parse block count to verify file existence/format, though not strictly used in mapping
-    _ = parse_logic_block_count(logic_block_count_path)
 
-    map_rams_with_arch(items, arch, max_series=max_series)
-    overhead_luts, _, _ = compute_overhead_luts(items)
-    mapping_lines = generate_mapping_lines(items, overhead_luts)
-    return mapping_lines
+    arch is a list of RAM type dicts or an Architecture (e.g. load_architecture("arch.json")).
+
+    engine selects the mapping implementation ("python", "pruned" or "numpy", see get_map_function).
+    cache is an optional ShapeCache shared between calls; read its stats() for hit/miss counts
+    (repeated shapes within one call are counted separately as dedup).
+    objective selects per-RAM minimum waste ("waste"), circuit area ("area") or the
+    time-budgeted per-circuit search ("exact"); exact_budget and exact_workers tune
+    "exact" (see run_mapper_batch).
+    stats is an optional MapperStats; afterwards stats.as_dict() holds per-stage wall
+    time ("parse", "map", ...) and the mapping counters.
+    sidecar=True loads the inputs from memory-mapped binary sidecars (see load_inputs).
+    """
+    with (stats.stage("parse") if stats is not None else _no_stage("parse")):
+        items, lb_counts = load_inputs(logical_rams_path, logic_block_count_path, compact=True,
+                                       sidecar=sidecar)
+
+    result = run_mapper_batch(items, [arch], max_series=max_series, engine=engine, cache=cache,
+                              objective=objective, logic_block_counts=lb_counts, stats=stats,
+                              exact_budget=exact_budget, exact_workers=exact_workers)[0]
+    return result["lines"]
 
 
 if __name__ == "__main__":
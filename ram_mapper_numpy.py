@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ram_mapper_numpy.py
+-------------------
+ECE1756 Assignment 3 - Vectorized RAM Mapping Engine
+
+Description:
+  * NumPy implementation of the greedy minimum-waste mapping in ram_mapper_core.
+  * Loads Depth/Width/Mode into arrays and broadcasts them against the
+    (type, phys_width, phys_depth) candidate matrix of each mode.
+  * Produces exactly the same assignments as map_rams_with_arch (ties resolve to
+    the first candidate in enumeration order, as with the strict '<' greedy).
+  * Distinct shapes are solved once and can be memoized in a ShapeCache.
+  * Overhead LUTs (decoder + mux) are computed column-wise as well
+    (compute_overhead_luts_numpy), together with per-circuit totals.
+
+Requires NumPy; ram_mapper_core.get_map_function falls back to the pure-Python
+engine when it is not installed.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ram_mapper_core import (MODE_MAP, Arch, Assignment, Items, MapperStats, ShapeCache,
+                             apply_assignments, arch_fingerprint, fallback_choice, item_column,
+                             mode_candidates, series_count)
+
+# Rows processed per broadcast step (bounds the N x C temporary arrays)
+CHUNK_ROWS = 65536
+
+# Waste value used to mask out candidates that violate the series limit
+_INVALID = np.iinfo(np.int64).max
+
+
+def _best_candidates(depth: np.ndarray,
+                     width: np.ndarray,
+                     cand: np.ndarray,
+                     max_series: int) -> np.ndarray:
+    """
+    Returns the index of the minimum-waste candidate per row, or -1 when every
+    candidate exceeds max_series.
+
+    cand is a (C, 3) array of (type_id, phys_width, phys_depth).
+    """
+    best = np.full(depth.shape[0], -1, dtype=np.int64)
+    if cand.shape[0] == 0:
+        return best
+
+    phys_width = cand[:, 1][None, :]
+    phys_depth = cand[:, 2][None, :]
+
+    for start in range(0, depth.shape[0], CHUNK_ROWS):
+        d = depth[start:start + CHUNK_ROWS, None]
+        w = width[start:start + CHUNK_ROWS, None]
+
+        # Blocks in parallel (P) and series (S), integer ceil-division
+        width_num = -(-w // phys_width)
+        depth_num = -(-d // phys_depth)
+
+        waste = width_num * phys_width * depth_num * phys_depth - d * w
+        waste[depth_num > max_series] = _INVALID
+
+        idx = np.argmin(waste, axis=1)
+        valid = waste[np.arange(idx.shape[0]), idx] != _INVALID
+        best[start:start + CHUNK_ROWS] = np.where(valid, idx, -1)
+
+    return best
+
+
+def assign_rams_with_arch_numpy(items: Items,
+                                arch: Arch,
+                                max_series: int = 16,
+                                cache: Optional[ShapeCache] = None,
+                                stats: Optional[MapperStats] = None) -> List[Assignment]:
+    """
+    Vectorized drop-in replacement for ram_mapper_core.assign_rams_with_arch.
+
+    Parameters:
+      items: Logical RAMs, item dicts or a RamTable (not modified).
+      arch: Architecture definition.
+      max_series: Maximum allowable blocks in series (default 16).
+      cache: Optional ShapeCache reused across calls (e.g. sweep points).
+      stats: Optional MapperStats to record candidate counters into.
+    """
+    if not items:
+        return []
+
+    n = len(items)
+    shapes = np.empty((n, 3), dtype=np.int64)
+    shapes[:, 0] = np.asarray(item_column(items, "Mode")) == MODE_MAP["TrueDualPort"]
+    shapes[:, 1] = np.asarray(item_column(items, "Depth"))
+    shapes[:, 2] = np.asarray(item_column(items, "Width"))
+
+    # Solve each distinct (tdp, Depth, Width) shape once
+    uniq, inverse = np.unique(shapes, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    choices = np.zeros((uniq.shape[0], 5), dtype=np.int64)
+
+    fingerprint = (arch_fingerprint(arch), max_series)
+    todo = np.ones(uniq.shape[0], dtype=bool)
+    if cache is not None:
+        for row, (tdp, depth, width) in enumerate(uniq.tolist()):
+            choice = cache.get((fingerprint, (bool(tdp), depth, width)))
+            if choice is not None:
+                choices[row] = choice
+                todo[row] = False
+        cache.dedup += n - uniq.shape[0]
+
+    for mode_str, tdp in (("TrueDualPort", 1), ("SinglePort", 0)):
+        rows = np.flatnonzero(todo & (uniq[:, 0] == tdp))
+        if rows.size == 0:
+            continue
+
+        depth = uniq[rows, 1]
+        width = uniq[rows, 2]
+        cand = np.array(mode_candidates(arch, mode_str), dtype=np.int64).reshape(-1, 3)
+        best = _best_candidates(depth, width, cand, max_series)
+
+        valid = best >= 0
+        if cand.shape[0]:
+            chosen = cand[best[valid]]
+            choices[rows[valid], 0] = chosen[:, 0]
+            choices[rows[valid], 1] = chosen[:, 2]
+            choices[rows[valid], 2] = chosen[:, 1]
+            choices[rows[valid], 3] = -(-depth[valid] // chosen[:, 2])
+            choices[rows[valid], 4] = -(-width[valid] // chosen[:, 1])
+
+        # Fallback: default to the first architecture type if no valid mapping found
+        for row in rows[~valid].tolist():
+            choices[row] = fallback_choice(arch, int(uniq[row, 2]))
+
+        if cache is not None:
+            for row in rows.tolist():
+                tdp_flag, depth_val, width_val = uniq[row].tolist()
+                cache.put((fingerprint, (bool(tdp_flag), depth_val, width_val)), tuple(choices[row].tolist()))
+
+    if stats is not None:
+        counts = np.bincount(inverse, minlength=uniq.shape[0]).tolist()
+        keys = [(bool(tdp), depth, width) for tdp, depth, width in uniq.tolist()]
+        stats.record_shapes(arch, max_series, [keys[row] for row in np.flatnonzero(todo).tolist()],
+                            dict(zip(keys, counts)))
+
+    # Fan the per-shape choices out to every item
+    return list(map(tuple, choices[inverse].tolist()))
+
+
+def map_rams_with_arch_numpy(items: Items,
+                             arch: Arch,
+                             max_series: int = 16,
+                             cache: Optional[ShapeCache] = None,
+                             stats: Optional[MapperStats] = None) -> None:
+    """
+    Vectorized drop-in replacement for ram_mapper_core.map_rams_with_arch
+    (mapping fields are filled in place).
+    """
+    apply_assignments(items, assign_rams_with_arch_numpy(items, arch, max_series, cache, stats))
+
+
+def compute_overhead_luts_numpy(items: Items,
+                                assignments: Optional[List[Assignment]] = None
+                                ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[int, int]]:
+    """
+    Vectorized ram_mapper_core.compute_overhead_luts (same rules, same numbers).
+
+    Returns (overhead, decoder, mux, circuit_totals): int64 arrays with one entry per
+    item, and Circuit ID -> total overhead LUTs of the circuit.
+    If assignments is given, series counts are taken from it instead of the items.
+    """
+    if assignments is None:
+        dnum = np.asarray(item_column(items, "small_depthnum"), dtype=np.int64)
+    else:
+        dnum = np.fromiter((series_count(choice) for choice in assignments), dtype=np.int64,
+                           count=len(assignments))
+    width = np.asarray(item_column(items, "Width"), dtype=np.int64)
+    tdp = np.asarray(item_column(items, "Mode")) == MODE_MAP["TrueDualPort"]
+
+    # Decoder: none for a single block, 1 LUT for 2 blocks, else one per block
+    series = dnum > 1
+    decoder = np.where(series, np.where(dnum == 2, 1, dnum), 0)
+
+    # MUX: one level of 4:1 LUTs up to 4 blocks, else (dnum // 4 + 1) levels
+    mux_levels = np.where(dnum <= 4, 1, dnum // 4 + 1)
+    mux = np.where(series, mux_levels * width, 0)
+
+    # TrueDualPort doubles both
+    factor = np.where(tdp, 2, 1)
+    decoder *= factor
+    mux *= factor
+    overhead = decoder + mux
+
+    circuits, circuit_idx = np.unique(np.asarray(item_column(items, "Circuit"), dtype=np.int64),
+                                      return_inverse=True)
+    # Summed as integers (bincount weights would round-trip through float64)
+    totals = np.zeros(circuits.shape[0], dtype=np.int64)
+    np.add.at(totals, circuit_idx.reshape(-1), overhead)
+    circuit_totals = dict(zip(circuits.tolist(), totals.tolist()))
+
+    return overhead, decoder, mux, circuit_totals
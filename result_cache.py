@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+result_cache.py
+---------------
+ECE1756 Assignment 3 - Content-Addressed Sweep Result Cache
+
+Description:
+  * Persists the mapping lines and area results of a sweep point on disk, keyed by a
+    SHA-256 of the logical RAM / logic block inputs, the architecture definition,
+    max_series and the mapping objective.
+  * Entries are written atomically (temp file + os.replace), so concurrent sweep
+    workers can share one cache directory; readers never see partial files.
+  * Total size is bounded: least-recently-used entries (by mtime, refreshed on every
+    hit) are evicted under an exclusive lock file.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import List, Optional
+
+from ram_mapper_core import Arch, arch_to_dicts
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; eviction then runs unlocked
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Part of every key; bump when the layout of stored entries changes
+FORMAT_VERSION = 2
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def result_key(input_digests: List[str],
+               arch: Arch,
+               max_series: int,
+               objective: str = "waste",
+               exact_budget: Optional[float] = None) -> str:
+    """
+    Content address of a sweep point: hash of the inputs, arch, max_series and objective
+    (and the per-circuit search budget of objective "exact", when one is given).
+    """
+    fields = {
+        "version": FORMAT_VERSION,
+        "inputs": input_digests,
+        "arch": arch_to_dicts(arch),
+        "max_series": max_series,
+        "objective": objective,
+    }
+    if exact_budget is not None:
+        fields["exact_budget"] = exact_budget
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of JSON entries named <key[:2]>/<key>.json, bounded to max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Returns the stored entry, or None if absent (or evicted while reading).
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """
+        Stores an entry atomically, then evicts old entries if over the size bound.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes least-recently-used entries until the cache fits in max_bytes.
+        """
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            entries = []
+            total = 0
+            for sub in os.scandir(self.directory):
+                if not sub.is_dir():
+                    continue
+                for entry in os.scandir(sub.path):
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
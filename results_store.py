@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+results_store.py
+----------------
+ECE1756 Assignment 3 - SQLite Store for Sweep Results
+
+Description:
+  * Records every evaluated architecture (per-type parameters), its per-circuit
+    resource counts, overhead LUTs, tiles and area in a local SQLite database.
+  * A sweep is written in one transaction with executemany, so recording results
+    costs next to nothing compared to mapping.
+  * Runs are indexed by area and by architecture parameters; the query command lists
+    the best N architectures or the Pareto set of two metrics.
+  * A run is identified by its inputs digest, architecture, max_series and objective
+    (run_key); recording the same run again replaces it instead of adding a duplicate.
+
+Usage:
+    python3 run_with_lutram_sweep.py --db results.db
+    python3 results_store.py results.db best -n 10 --kind with_lutram
+    python3 results_store.py results.db pareto --x geo_mean_area --y size_bits
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Iterable, List, Optional
+
+from area_model import ram_type_params
+from ram_mapper_core import arch_to_dicts
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT,
+    size_bits INTEGER,
+    max_width INTEGER,
+    lb_per_bram INTEGER,
+    with_lutram INTEGER NOT NULL,
+    num_brams INTEGER NOT NULL,
+    max_series INTEGER NOT NULL,
+    objective TEXT NOT NULL,
+    inputs TEXT,
+    total_extra_luts INTEGER NOT NULL,
+    total_tiles INTEGER NOT NULL,
+    total_area REAL NOT NULL,
+    geo_mean_area REAL NOT NULL,
+    run_key TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_geo ON runs (geo_mean_area);
+CREATE INDEX IF NOT EXISTS runs_params ON runs (size_bits, max_width, lb_per_bram);
+CREATE INDEX IF NOT EXISTS runs_kind ON runs (kind, geo_mean_area);
+
+-- Kept out of runs so that scans over runs stay narrow
+CREATE TABLE IF NOT EXISTS run_archs (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id),
+    arch_json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS arch_types (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    type_id INTEGER NOT NULL,
+    lutram INTEGER NOT NULL,
+    capacity_bits INTEGER NOT NULL,
+    max_width INTEGER NOT NULL,
+    lb_per_bram INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS arch_types_params ON arch_types (capacity_bits, max_width, lb_per_bram);
+CREATE INDEX IF NOT EXISTS arch_types_run ON arch_types (run_id);
+
+CREATE TABLE IF NOT EXISTS circuits (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    circuit INTEGER NOT NULL,
+    logic_blocks INTEGER NOT NULL,
+    extra_luts INTEGER NOT NULL,
+    tiles INTEGER NOT NULL,
+    area REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS circuits_run ON circuits (run_id);
+
+CREATE TABLE IF NOT EXISTS circuit_blocks (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    circuit INTEGER NOT NULL,
+    type_id INTEGER NOT NULL,
+    blocks INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS circuit_blocks_run ON circuit_blocks (run_id);
+"""
+
+# Created after _add_run_keys has upgraded a database written before run_key existed
+KEY_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS runs_key ON runs (run_key)"
+
+# Per-run detail tables, replaced when a run is recorded again
+DETAIL_TABLES = ("run_archs", "arch_types", "circuits", "circuit_blocks")
+
+# Run columns that best/pareto may rank by (all minimized)
+METRICS = ("geo_mean_area", "total_area", "total_extra_luts", "total_tiles",
+           "size_bits", "max_width", "lb_per_bram")
+
+
+def circuit_rows(report: dict) -> List[list]:
+    """
+    Flattens the circuits of an evaluate_area report into JSON-friendly rows:
+    [circuit, logic_blocks, extra_luts, tiles, area, [[type_id, blocks], ...]].
+    """
+    return [[circuit, c["logic_blocks"], c["extra_luts"], c["tiles"], c["area"],
+             sorted(c["blocks"].items())]
+            for circuit, c in report["circuits"].items()]
+
+
+def run_key(inputs: Optional[str], arch_json: str, max_series: int, objective: str) -> str:
+    """
+    Identity of a run: digest of its inputs digest, architecture JSON, max_series and
+    objective.
+    """
+    payload = json.dumps([inputs, arch_json, max_series, objective])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultsStore:
+    """
+    SQLite database of evaluated architectures (see SCHEMA).
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if "run_key" not in {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}:
+            self._add_run_keys()
+        self.conn.execute(KEY_INDEX)
+
+    def _add_run_keys(self) -> None:
+        """
+        Upgrades an older database: adds run_key and keeps only the latest of the runs
+        that share one.
+        """
+        with self.conn:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN run_key TEXT")
+            latest = {}
+            for run_id, inputs, max_series, objective, arch_json in self.conn.execute(
+                    "SELECT id, inputs, max_series, objective, arch_json "
+                    "FROM runs JOIN run_archs ON run_id = id ORDER BY id"):
+                latest[run_key(inputs, arch_json, max_series, objective)] = run_id
+            self.conn.executemany("UPDATE runs SET run_key = ? WHERE id = ?",
+                                  list(latest.items()))
+            stale = [(run_id,) for (run_id,) in self.conn.execute(
+                "SELECT id FROM runs WHERE run_key IS NULL")]
+            for table in DETAIL_TABLES:
+                self.conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", stale)
+            self.conn.executemany("DELETE FROM runs WHERE id = ?", stale)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_runs(self, runs: Iterable[dict]) -> int:
+        """
+        Records runs in a single transaction; returns the number of runs recorded.
+        A run already in the database (same run_key) is replaced in place.
+
+        Each run is a dict with kind, arch, max_series, objective, circuits
+        (circuit_rows), total_area, geo_mean_area and optionally label, point
+        ((size_bits, max_width, lb_per_bram) of a single-BRAM sweep) and inputs
+        (digest of the input files).
+        """
+        now = time.time()
+        count = 0
+        with self.conn:
+            cur = self.conn.cursor()
+            for run in runs:
+                arch = run["arch"]
+                point = run.get("point") or (None, None, None)
+                rows = run["circuits"]
+                params = [ram_type_params(ram) for ram in arch]
+                arch_json = json.dumps(arch_to_dicts(arch), sort_keys=True)
+                key = run_key(run.get("inputs"), arch_json, run["max_series"], run["objective"])
+                run_id = cur.execute(
+                    "INSERT INTO runs (created, kind, label, size_bits, max_width, lb_per_bram, "
+                    "with_lutram, num_brams, max_series, objective, inputs, total_extra_luts, "
+                    "total_tiles, total_area, geo_mean_area, run_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (run_key) DO UPDATE SET created = excluded.created, "
+                    "kind = excluded.kind, label = excluded.label, "
+                    "size_bits = excluded.size_bits, max_width = excluded.max_width, "
+                    "lb_per_bram = excluded.lb_per_bram, "
+                    "total_extra_luts = excluded.total_extra_luts, "
+                    "total_tiles = excluded.total_tiles, total_area = excluded.total_area, "
+                    "geo_mean_area = excluded.geo_mean_area RETURNING id",
+                    (now, run["kind"], run.get("label"), point[0], point[1], point[2],
+                     int(any(p[0] for p in params)), sum(1 for p in params if not p[0]),
+                     run["max_series"], run["objective"], run.get("inputs"),
+                     sum(r[2] for r in rows), sum(r[3] for r in rows),
+                     run["total_area"], run["geo_mean_area"], key)).fetchone()[0]
+                for table in DETAIL_TABLES:
+                    cur.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+                cur.execute("INSERT INTO run_archs VALUES (?, ?)", (run_id, arch_json))
+                cur.executemany(
+                    "INSERT INTO arch_types VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, ram["type_id"], int(lutram), ram["capacity_bits"], max_width, lb)
+                     for ram, (lutram, lb, max_width) in zip(arch, params)])
+                cur.executemany(
+                    "INSERT INTO circuits VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, r[0], r[1], r[2], r[3], r[4]) for r in rows])
+                cur.executemany(
+                    "INSERT INTO circuit_blocks VALUES (?, ?, ?, ?)",
+                    [(run_id, r[0], type_id, blocks) for r in rows for type_id, blocks in r[5]])
+                count += 1
+        return count
+
+    def _where(self, kind: Optional[str]):
+        return ("WHERE kind = ?", (kind,)) if kind else ("", ())
+
+    def best(self, n: int = 10, metric: str = "geo_mean_area", kind: Optional[str] = None) -> List[tuple]:
+        """
+        Returns the n runs with the smallest metric as
+        (id, kind, size_bits, max_width, lb_per_bram, geo_mean_area, metric value, arch_json).
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+        where, args = self._where(kind)
+        # Rank in runs alone, then join the n winners with their architectures
+        return self.conn.execute(
+            f"SELECT id, kind, size_bits, max_width, lb_per_bram, geo_mean_area, value, arch_json "
+            f"FROM (SELECT id, kind, size_bits, max_width, lb_per_bram, geo_mean_area, "
+            f"{metric} AS value FROM runs {where} ORDER BY {metric}, id LIMIT ?) "
+            f"JOIN run_archs ON run_id = id ORDER BY value, id", args + (n,)).fetchall()
+
+    def pareto(self, x: str = "geo_mean_area", y: str = "total_extra_luts",
+               kind: Optional[str] = None) -> List[tuple]:
+        """
+        Returns the runs not dominated in (x, y), both minimized, sorted by x, as
+        (id, kind, size_bits, max_width, lb_per_bram, x value, y value, arch_json).
+        """
+        for metric in (x, y):
+            if metric not in METRICS:
+                raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+        where, args = self._where(kind)
+        # Sweep (x, y, id) only; fetch the details of the front afterwards
+        points = self.conn.execute(f"SELECT {x}, {y}, id FROM runs {where}", args).fetchall()
+        points.sort()
+        front = []
+        best_y = None
+        for _, y_value, run_id in points:
+            if best_y is None or y_value < best_y:
+                front.append(run_id)
+                best_y = y_value
+        if not front:
+            return []
+        rows = {row[0]: row for row in self.conn.execute(
+            f"SELECT id, kind, size_bits, max_width, lb_per_bram, {x}, {y}, arch_json "
+            f"FROM runs JOIN run_archs ON run_id = id "
+            f"WHERE id IN ({', '.join('?' * len(front))})", front)}
+        return [rows[run_id] for run_id in front]
+
+
+def describe_arch(arch_json: str) -> str:
+    parts = []
+    for ram in json.loads(arch_json):
+        lutram, lb_per_bram, max_width = ram_type_params(ram)
+        if lutram:
+            parts.append(f"LUTRAM/R{lb_per_bram}")
+        else:
+            parts.append(f"{ram['capacity_bits']}b/W{max_width}/R{lb_per_bram}")
+    return " + ".join(parts)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Query stored sweep results.")
+    parser.add_argument("db", help="SQLite database written by the sweeps (--db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    best = sub.add_parser("best", help="best N architectures by a metric")
+    best.add_argument("-n", type=int, default=10)
+    best.add_argument("--metric", choices=METRICS, default="geo_mean_area")
+    pareto = sub.add_parser("pareto", help="Pareto set of two metrics (both minimized)")
+    pareto.add_argument("--x", choices=METRICS, default="geo_mean_area")
+    pareto.add_argument("--y", choices=METRICS, default="total_extra_luts")
+    for p in (best, pareto):
+        p.add_argument("--kind", help="only runs of this sweep kind (e.g. with_lutram)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with ResultsStore(args.db) as store:
+        if args.command == "best":
+            rows = store.best(args.n, args.metric, args.kind)
+            columns = ("geo_mean_area", args.metric)
+        else:
+            rows = store.pareto(args.x, args.y, args.kind)
+            columns = (args.x, args.y)
+    elapsed = time.perf_counter() - start
+
+    print(f"  {'run':>6} {'kind':<12} {columns[0]:>16} {columns[1]:>16}  architecture")
+    for run_id, kind, _, _, _, first, second, arch_json in rows:
+        print(f"  {run_id:>6} {kind:<12} {first:>16.6g} {second:>16.6g}  {describe_arch(arch_json)}")
+    print(f"[{args.command}] {len(rows)} runs in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
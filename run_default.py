@@ -4,33 +4,63 @@
 """
 run_default.py
 --------------
-Runs the RAM mapper using the default Stratix-IV-like architecture.
+Runs the RAM mapper using the default Stratix-IV-like architecture
+(or an architecture JSON spec given with --arch).
 
 Usage:
     python3 run_default.py > ram_mapping.txt
+    python3 run_default.py -o ram_mapping.txt   (streams straight to the file)
+    python3 run_default.py --arch my_arch.json > ram_mapping.txt
     ./checker -d logical_rams.txt logic_block_count.txt ram_mapping.txt
 """
 
-import sys
-from ram_mapper_core import build_default_arch, run_mapper
+import argparse
+from ram_mapper_core import (DEFAULT_EXACT_BUDGET, OBJECTIVES, Architecture, build_default_arch,
+                             load_architecture, run_mapper, stream_mapper)
 
 
 def main():
     # 1. Determine input file paths
-    if len(sys.argv) >= 3:
-        logical_rams_path = sys.argv[1]
-        logic_block_count_path = sys.argv[2]
-    else:
-        logical_rams_path = "logical_rams.txt"
-        logic_block_count_path = "logic_block_count.txt"
+    parser = argparse.ArgumentParser(description="Map logical RAMs onto the default architecture.")
+    parser.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+    parser.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+    parser.add_argument("-o", "--output",
+                        help="stream the mapping to this file with flat memory use")
+    parser.add_argument("--arch",
+                        help="architecture JSON spec (default: Stratix-IV-like architecture)")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="waste",
+                        help="mapping objective (see ram_mapper_core.run_mapper)")
+    parser.add_argument("--exact-budget", type=float, metavar="SECONDS",
+                        default=DEFAULT_EXACT_BUDGET,
+                        help=f"--objective exact: seconds of search per circuit "
+                             f"(default {DEFAULT_EXACT_BUDGET})")
+    parser.add_argument("--exact-workers", type=int, default=0, metavar="N",
+                        help="--objective exact: circuits solved in parallel "
+                             "(default 0 = one per CPU core)")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    args = parser.parse_args()
 
-    # 2. Build the default architecture
-    arch = build_default_arch()
+    # 2. Build the default architecture, or load and validate the given spec
+    if args.arch:
+        arch = load_architecture(args.arch)
+    else:
+        arch = Architecture(build_default_arch())
 
-    # 3. Execute the mapper logic
-    lines = run_mapper(logical_rams_path, logic_block_count_path, arch)
+    # 3. Stream parse -> map -> write when an output file is given (per-RAM minimum waste only)
+    if args.output and args.objective == "waste":
+        with open(args.output, "w", buffering=1 << 20) as out:
+            stream_mapper(args.logical_rams_path, arch, out)
+        return
 
-    # 4. Output results to stdout
+    # 4. Otherwise execute the mapper logic and output results to stdout (or the file)
+    lines = run_mapper(args.logical_rams_path, args.logic_block_count_path, arch,
+                       objective=args.objective, sidecar=args.sidecar,
+                       exact_budget=args.exact_budget, exact_workers=args.exact_workers or None)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.writelines(line + "\n" for line in lines)
+        return
     for line in lines:
         print(line)
 
@@ -9,11 +9,13 @@ Executes a parameter sweep for Part (f): Architecture WITH LUTRAM (Type 1) + 1 B
 Workflow:
   * Iterates through defined (size_bits, max_width, lb_per_bram) combinations for the BRAM.
   * LUTRAM is fixed (640 bits, 64x10/32x20).
-  * Calls checker with flags for both LUTRAM and BRAM.
+  * Evaluates area in-process; --checker also calls checker with flags for LUTRAM and BRAM.
 """
 
-import subprocess
-from ram_mapper_core import build_arch_lutram_plus_bram, run_mapper
+import argparse
+
+from ram_mapper_core import DEFAULT_EXACT_BUDGET, OBJECTIVES
+from sweep_runner import run_sweep
 
 
 # Test Configurations: (size_bits, max_width, lb_per_bram)
@@ -71,41 +73,46 @@ LOGIC_BLOCKS = "logic_block_count.txt"
 
 
 def main():
-    for size_bits, max_width, lb_per_bram in CANDIDATES:
-        print("=" * 80)
-        print(f"[With LUTRAM] size={size_bits} bits, max_width={max_width}, "
-              f"LBs/BRAM={lb_per_bram}")
-
-        # 1. Construct architecture (Type 1 = LUTRAM, Type 2 = BRAM)
-        arch = build_arch_lutram_plus_bram(size_bits, max_width, lb_per_bram)
-
-        # 2. Run mapper
-        lines = run_mapper(LOGICAL_RAMS, LOGIC_BLOCKS, arch)
-
-        # 3. Write mapping to file
-        out_name = f"mapping_LUT+BRAM_{size_bits}b_W{max_width}_R{lb_per_bram}.txt"
-        with open(out_name, "w") as f:
-            for line in lines:
-                f.write(line + "\n")
-        print(f"  -> mapping written to {out_name}")
-
-        # 4. Run checker
-        cmd = [
-            "./checker",
-            "-t",
-            "-l", "1", "1",  # Type 1: LUTRAM, ratio 1:1
-            "-b", str(size_bits), str(max_width), str(lb_per_bram), "1",  # Type 2: BRAM
-            LOGICAL_RAMS,
-            LOGIC_BLOCKS,
-            out_name,
-
-        ]
-        print("  -> Running command:", " ".join(cmd))
-        result = subprocess.run(cmd, text=True, capture_output=True)
-        print(result.stdout)
-        if result.stderr:
-            print("[checker stderr]")
-            print(result.stderr)
+    parser = argparse.ArgumentParser(description="Part (f) sweep: LUTRAM + one Block RAM type.")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes (0 = one per CPU core, default 1)")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="waste",
+                        help="waste: per-RAM minimum waste (default); area: refined for "
+                             "circuit tile count; exact: per-circuit branch-and-bound "
+                             "(--exact-budget)")
+    parser.add_argument("--exact-budget", type=float, default=DEFAULT_EXACT_BUDGET,
+                        metavar="SECONDS",
+                        help=f"--objective exact: seconds of search per circuit "
+                             f"(default {DEFAULT_EXACT_BUDGET})")
+    parser.add_argument("--exact-workers", type=int, default=0, metavar="N",
+                        help="--objective exact: circuits of a point solved in parallel "
+                             "(default 0 = CPU cores / sweep workers)")
+    parser.add_argument("--checker", action="store_true",
+                        help="also run ./checker on each mapping as a cross-check")
+    parser.add_argument("--checker-bin", default="./checker",
+                        help="checker executable (e.g. ./fake_checker.py, default ./checker)")
+    parser.add_argument("--checker-jobs", type=int, default=4,
+                        help="checker runs at once (default 4)")
+    parser.add_argument("--checker-timeout", type=float, default=300.0,
+                        help="seconds before a checker run is killed and retried (default 300)")
+    parser.add_argument("--cache-dir",
+                        help="reuse mapping/area results of unchanged points from this directory")
+    parser.add_argument("--cache-size", type=int, default=512,
+                        help="result cache size bound in MB (default 512)")
+    parser.add_argument("--db", help="record every point in this SQLite results database")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="journal completed points in FILE; rerun with it to resume")
+    args = parser.parse_args()
+
+    run_sweep("with_lutram", CANDIDATES, LOGICAL_RAMS, LOGIC_BLOCKS,
+              workers=args.workers or None, objective=args.objective,
+              use_checker=args.checker, cache_dir=args.cache_dir,
+              cache_bytes=args.cache_size * 1024 * 1024, checker=args.checker_bin,
+              checker_jobs=args.checker_jobs, checker_timeout=args.checker_timeout,
+              db_path=args.db, sidecar=args.sidecar, checkpoint_path=args.checkpoint,
+              exact_budget=args.exact_budget, exact_workers=args.exact_workers or None)
 
 
 if __name__ == "__main__":
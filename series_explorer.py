@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+series_explorer.py
+------------------
+Single-pass exploration of the max_series limit.
+
+Workflow:
+  * Enumerates the configurations of every distinct logical RAM shape once and keeps
+    the best one per series-count bucket (ram_mapper_core.assign_rams_series), which
+    yields the minimum-waste mapping for every requested max_series at once.
+  * Summarizes each limit: bit waste, physical blocks per type, RAMs built in series,
+    decoder / MUX overhead LUTs (compute_overhead_luts) and, with logic block counts,
+    tiles and area (area_model.evaluate_area).
+  * Reports the limit with the smallest geometric average area and can write its
+    mapping file.
+
+Usage:
+    python3 series_explorer.py --limits 1,2,4,8,16,32 [--arch my_arch.json] [-o ram_mapping.txt]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from area_model import evaluate_area
+from ram_mapper_core import (ENGINES, Arch, Architecture, Items, assign_rams_series,
+                             build_default_arch, generate_mapping_lines, get_overhead_function,
+                             item_column, load_architecture, load_inputs, write_lines)
+
+
+def explore_series(items: Items,
+                   arch: Arch,
+                   limits: List[int],
+                   logic_block_counts: Optional[Dict[int, int]] = None,
+                   engine: str = "python") -> List[dict]:
+    """
+    Maps items under every max_series in limits with one enumeration pass.
+
+    Returns one summary dict per limit, in increasing limit order:
+      max_series: The limit.
+      assignments: Assignment per item (as assign_rams_with_arch(items, arch, limit)).
+      overhead_luts: Additional LUTs per item.
+      waste_bits: Allocated minus used bits over all RAMs.
+      blocks: type_id -> physical blocks.
+      series_rams: RAMs implemented with more than one block in series.
+      fallbacks: RAMs no configuration fits within the limit (fallback_choice).
+      extra_luts, decoder_luts, mux_luts: Overhead LUT totals.
+      total_area, geo_mean_area, tiles: With logic_block_counts only (else None).
+    """
+    overhead_fn = get_overhead_function(engine)
+    depths = item_column(items, "Depth")
+    widths = item_column(items, "Width")
+    summaries: List[dict] = []
+    for limit, assignments in sorted(assign_rams_series(items, arch, limits).items()):
+        overhead, decoder, mux = overhead_fn(items, assignments)[:3]
+        waste_bits = 0
+        blocks: Dict[int, int] = {}
+        series_rams = fallbacks = 0
+        for (type_id, phys_depth, phys_width, depth_num, width_num), depth, width in zip(
+                assignments, depths, widths):
+            total_depth = depth_num * phys_depth
+            total_width = width_num * phys_width
+            if total_depth < depth or total_width < width:
+                fallbacks += 1
+            else:
+                waste_bits += total_depth * total_width - depth * width
+            blocks[type_id] = blocks.get(type_id, 0) + depth_num * width_num
+            series_rams += depth_num > 1
+
+        summary = {
+            "max_series": limit,
+            "assignments": assignments,
+            "overhead_luts": overhead,
+            "waste_bits": waste_bits,
+            "blocks": dict(sorted(blocks.items())),
+            "series_rams": series_rams,
+            "fallbacks": fallbacks,
+            "extra_luts": int(sum(overhead)),
+            "decoder_luts": int(sum(decoder)),
+            "mux_luts": int(sum(mux)),
+            "total_area": None,
+            "geo_mean_area": None,
+            "tiles": None,
+        }
+        if logic_block_counts is not None:
+            report = evaluate_area(items, assignments, overhead, logic_block_counts, arch)
+            summary["total_area"] = report["total_area"]
+            summary["geo_mean_area"] = report["geo_mean_area"]
+            summary["tiles"] = sum(c["tiles"] for c in report["circuits"].values())
+        summaries.append(summary)
+    return summaries
+
+
+def best_limit(summaries: List[dict]) -> dict:
+    """
+    Returns the summary with the smallest geometric average area, preferring the
+    smaller limit on ties (and the smallest bit waste without area results).
+    """
+    if all(s["geo_mean_area"] is not None for s in summaries):
+        return min(summaries, key=lambda s: (s["fallbacks"], s["geo_mean_area"], s["max_series"]))
+    return min(summaries, key=lambda s: (s["fallbacks"], s["waste_bits"], s["max_series"]))
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate many max_series limits in one pass.")
+    parser.add_argument("--limits", type=_int_list, default=[1, 2, 3, 4, 6, 8, 12, 16, 24, 32],
+                        help="max_series values to evaluate (comma-separated)")
+    parser.add_argument("--arch",
+                        help="architecture JSON spec (default: Stratix-IV-like architecture)")
+    parser.add_argument("--engine", choices=ENGINES, default="python",
+                        help="overhead LUT engine (mappings are engine-independent)")
+    parser.add_argument("-o", "--output", help="write the mapping of the best limit to this file")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    parser.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+    parser.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+    args = parser.parse_args(argv)
+    if not args.limits or min(args.limits) < 1:
+        parser.error("--limits needs positive integers")
+
+    items, lb_counts = load_inputs(args.logical_rams_path, args.logic_block_count_path,
+                                   compact=True, sidecar=args.sidecar)
+    arch = load_architecture(args.arch) if args.arch else Architecture(build_default_arch())
+    start = time.perf_counter()
+    summaries = explore_series(items, arch, args.limits, lb_counts, engine=args.engine)
+    elapsed = time.perf_counter() - start
+    best = best_limit(summaries)
+
+    type_ids = [ram["type_id"] for ram in arch]
+    print(f"  {'S_max':>5} {'waste_bits':>14} {'series':>7} {'decoder':>9} {'mux':>10} "
+          + " ".join(f"{'Type' + str(t):>9}" for t in type_ids)
+          + f" {'tiles':>11} {'geo_area':>14}")
+    for s in summaries:
+        mark = " <- best" if s is best else ""
+        if s["fallbacks"]:
+            mark += f" ({s['fallbacks']} RAMs do not fit)"
+        print(f"  {s['max_series']:>5} {s['waste_bits']:>14} {s['series_rams']:>7} "
+              f"{s['decoder_luts']:>9} {s['mux_luts']:>10} "
+              + " ".join(f"{s['blocks'].get(t, 0):>9}" for t in type_ids)
+              + f" {s['tiles']:>11} {s['geo_mean_area']:>14.6g}{mark}")
+    print(f"[Series] {len(summaries)} limits evaluated in {elapsed:.2f}s; "
+          f"best max_series={best['max_series']}")
+
+    if args.output:
+        lines = generate_mapping_lines(items, best["overhead_luts"], best["assignments"])
+        with open(args.output, "w", buffering=1 << 20) as out:
+            write_lines(lines, out)
+        print(f"  -> mapping for max_series={best['max_series']} written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
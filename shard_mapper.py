@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+shard_mapper.py
+---------------
+ECE1756 Assignment 3 - Per-Circuit Sharded Mapping
+
+Description:
+  * Circuits are mapped independently, so the input can be split by Circuit into
+    shards that are mapped in parallel: by a local process pool, or by separate
+    invocations (other machines) that each write a shard file.
+  * Every invocation computes the same partition from the input itself (circuits
+    balanced by RAM count, largest first), so shards never overlap.
+  * Shard files keep the input row of every line. Merging restores the original line
+    order and renumbers the group IDs, so the merged mapping is identical to an
+    unsharded run_mapper output (and valid for ./checker). The exception is objective
+    "exact": its search is time-budgeted, so each run (sharded or not) may return a
+    different mapping of the same quality bound.
+  * Each shard solves its "exact" circuits with exact_workers processes (default 1),
+    so the shard processes do not oversubscribe the CPUs.
+  * A shard file header records the shard index, the shard count and a hash of the
+    inputs, architecture, max_series, objective (and the exact budget); merge refuses
+    shards that do not belong together or do not cover every shard.
+
+Usage:
+    python3 shard_mapper.py run --shards 8 -j 4 -o ram_mapping.txt
+    python3 shard_mapper.py map --shard 0/4 -o shard0.txt      (one per machine)
+    python3 shard_mapper.py merge -o ram_mapping.txt shard0.txt shard1.txt shard2.txt shard3.txt
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ram_mapper_core import (DEFAULT_EXACT_BUDGET, ENGINES, OBJECTIVES, Arch, Architecture,
+                             Items, RamTable, build_default_arch, item_column,
+                             load_architecture, load_inputs, run_mapper_batch, write_lines)
+from result_cache import file_digest, result_key
+
+SHARD_HEADER = "#shard "
+
+# (input row, mapping line) pairs of one shard, in input order
+ShardLines = List[Tuple[int, str]]
+
+
+def partition_circuits(items: Items, num_shards: int) -> List[List[int]]:
+    """
+    Splits the circuits into num_shards groups with balanced RAM counts
+    (largest circuit first onto the least loaded shard). Deterministic for a given input.
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+    counts: Dict[int, int] = {}
+    for circuit in item_column(items, "Circuit"):
+        counts[circuit] = counts.get(circuit, 0) + 1
+
+    shards: List[List[int]] = [[] for _ in range(num_shards)]
+    loads = [(0, k) for k in range(num_shards)]
+    for circuit, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+        load, k = heapq.heappop(loads)
+        shards[k].append(circuit)
+        heapq.heappush(loads, (load + count, k))
+    return [sorted(shard) for shard in shards]
+
+
+def shard_rows(items: Items, circuits: Iterable[int]) -> List[int]:
+    """
+    Input rows (in order) of the RAMs that belong to the given circuits.
+    """
+    wanted = set(circuits)
+    return [row for row, circuit in enumerate(item_column(items, "Circuit")) if circuit in wanted]
+
+
+def map_shard(items: RamTable,
+              lb_counts: Dict[int, int],
+              rows: List[int],
+              arch: Arch,
+              max_series: int = 16,
+              engine: str = "python",
+              objective: str = "waste",
+              exact_budget: Optional[float] = None,
+              exact_workers: Optional[int] = 1) -> ShardLines:
+    """
+    Maps the given input rows on their own; returns (input row, mapping line) pairs.
+    Group IDs are local to the shard until merge_shards renumbers them.
+    exact_budget / exact_workers tune objective "exact" (see run_mapper_batch).
+    """
+    if not rows:
+        return []
+    result = run_mapper_batch(items.take(rows), [arch], max_series=max_series, engine=engine,
+                              objective=objective, logic_block_counts=lb_counts,
+                              exact_budget=exact_budget, exact_workers=exact_workers)[0]
+    return list(zip(rows, result["lines"]))
+
+
+def _renumber(line: str, next_id: int) -> Tuple[str, int]:
+    """
+    Rewrites the group IDs of one mapping line to next_id, next_id + 1, ...
+    (in order of first appearance); returns the line and the next free ID.
+    """
+    tokens = line.split(" ")
+    ids: Dict[str, str] = {}
+    for pos in range(len(tokens) - 1):
+        if tokens[pos] == "ID":
+            local = tokens[pos + 1]
+            if local not in ids:
+                ids[local] = str(next_id)
+                next_id += 1
+            tokens[pos + 1] = ids[local]
+    return " ".join(tokens), next_id
+
+
+def merge_shards(shards: Iterable[Iterable[Tuple[int, str]]]) -> Iterator[str]:
+    """
+    Merges shards (each ordered by input row) into mapping lines in input order,
+    with group IDs numbered globally as generate_mapping_lines would.
+    """
+    next_id = 0
+    previous = -1
+    for row, line in heapq.merge(*shards, key=lambda pair: pair[0]):
+        if row <= previous:
+            raise ValueError(f"Input row {row} appears in more than one shard")
+        previous = row
+        line, next_id = _renumber(line, next_id)
+        yield line
+
+
+# ------------------------- Shard Files -------------------------
+
+def shard_key(logical_rams_path: str,
+              logic_block_count_path: str,
+              arch: Arch,
+              max_series: int,
+              objective: str,
+              exact_budget: Optional[float] = None) -> str:
+    """
+    Identifies the mapping job a shard belongs to (see result_cache.result_key); the
+    search budget is part of it for objective "exact".
+    """
+    if objective == "exact":
+        exact_budget = DEFAULT_EXACT_BUDGET if exact_budget is None else exact_budget
+    else:
+        exact_budget = None
+    return result_key([file_digest(logical_rams_path), file_digest(logic_block_count_path)],
+                      arch, max_series, objective, exact_budget)
+
+
+def write_shard_file(path: str, header: dict, lines: ShardLines) -> None:
+    """
+    Writes a shard file atomically: a header line, then "<input row> <mapping line>" lines.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", buffering=1 << 20) as f:
+            f.write(SHARD_HEADER + json.dumps(header, sort_keys=True) + "\n")
+            write_lines((f"{row} {line}" for row, line in lines), f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def read_shard_header(path: str) -> dict:
+    with open(path, "r") as f:
+        first = f.readline()
+    if not first.startswith(SHARD_HEADER):
+        raise ValueError(f"{path} is not a shard file (no '{SHARD_HEADER.strip()}' header)")
+    return json.loads(first[len(SHARD_HEADER):])
+
+
+def iter_shard_file(path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Streams the (input row, mapping line) pairs of a shard file.
+    """
+    with open(path, "r") as f:
+        f.readline()
+        for line in f:
+            row, _, mapping = line.rstrip("\n").partition(" ")
+            if mapping:
+                yield int(row), mapping
+
+
+def merge_shard_files(paths: List[str], out: TextIO) -> int:
+    """
+    Checks that the shard files form one complete job, then streams their merged
+    mapping to out. Returns the number of lines written.
+    """
+    headers = [read_shard_header(path) for path in paths]
+    if not headers:
+        raise ValueError("No shard files to merge")
+    keys = {h["key"] for h in headers}
+    if len(keys) != 1:
+        raise ValueError("Shard files come from different inputs, architectures or settings")
+    num_shards = headers[0]["shards"]
+    found = sorted(h["shard"] for h in headers)
+    if found != list(range(num_shards)):
+        missing = sorted(set(range(num_shards)) - set(found))
+        raise ValueError(f"Expected shards 0..{num_shards - 1} exactly once; "
+                         f"got {found} (missing {missing})")
+    count = write_lines(merge_shards(iter_shard_file(path) for path in paths), out)
+    expected = sum(h["rows"] for h in headers)
+    if count != expected:
+        raise ValueError(f"Merged {count} lines but the shard headers list {expected} rows")
+    return count
+
+
+# ------------------------- Process Pool -------------------------
+
+# Per-process state, filled by _init_worker
+_WORKER: dict = {}
+
+
+def _init_worker(logical_rams_path: str, logic_block_count_path: str, sidecar: bool) -> None:
+    items, lb_counts = load_inputs(logical_rams_path, logic_block_count_path, compact=True,
+                                   sidecar=sidecar)
+    _WORKER.update({"items": items, "lb_counts": lb_counts})
+
+
+def _map_shard_task(circuits: List[int], arch: Arch, max_series: int, engine: str,
+                    objective: str, exact_budget: Optional[float],
+                    exact_workers: Optional[int]) -> ShardLines:
+    items = _WORKER["items"]
+    return map_shard(items, _WORKER["lb_counts"], shard_rows(items, circuits), arch,
+                     max_series=max_series, engine=engine, objective=objective,
+                     exact_budget=exact_budget, exact_workers=exact_workers)
+
+
+def run_sharded(logical_rams_path: str,
+                logic_block_count_path: str,
+                arch: Arch,
+                num_shards: Optional[int] = None,
+                workers: Optional[int] = None,
+                max_series: int = 16,
+                engine: str = "python",
+                objective: str = "waste",
+                sidecar: bool = False,
+                exact_budget: Optional[float] = None,
+                exact_workers: Optional[int] = 1) -> Iterator[str]:
+    """
+    Maps the input shard by shard in a process pool and returns the merged mapping
+    lines (identical to run_mapper's, except for the time-budgeted objective "exact").
+
+    num_shards defaults to the number of workers; workers=None uses every CPU core.
+    exact_workers is per shard process (default 1, as the shards already run in parallel).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, workers)
+    num_shards = num_shards or workers
+
+    items, _ = load_inputs(logical_rams_path, logic_block_count_path, compact=True,
+                           sidecar=sidecar)
+    partition = partition_circuits(items, num_shards)
+    args = (arch, max_series, engine, objective, exact_budget, exact_workers)
+
+    if workers == 1:
+        _init_worker(logical_rams_path, logic_block_count_path, sidecar)
+        shards = [_map_shard_task(circuits, *args) for circuits in partition]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, num_shards), initializer=_init_worker,
+                                 initargs=(logical_rams_path, logic_block_count_path,
+                                           sidecar)) as pool:
+            futures = [pool.submit(_map_shard_task, circuits, *args) for circuits in partition]
+            shards = [future.result() for future in futures]
+    return merge_shards(shards)
+
+
+def map_shard_file(logical_rams_path: str,
+                   logic_block_count_path: str,
+                   arch: Arch,
+                   shard: int,
+                   num_shards: int,
+                   output_path: str,
+                   max_series: int = 16,
+                   engine: str = "python",
+                   objective: str = "waste",
+                   sidecar: bool = False,
+                   exact_budget: Optional[float] = None,
+                   exact_workers: Optional[int] = 1) -> dict:
+    """
+    Maps shard `shard` of `num_shards` and writes it to output_path (for merge_shard_files).
+    Returns the shard header.
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"Shard index {shard} out of range for {num_shards} shards")
+    items, lb_counts = load_inputs(logical_rams_path, logic_block_count_path, compact=True,
+                                   sidecar=sidecar)
+    circuits = partition_circuits(items, num_shards)[shard]
+    lines = map_shard(items, lb_counts, shard_rows(items, circuits), arch,
+                      max_series=max_series, engine=engine, objective=objective,
+                      exact_budget=exact_budget, exact_workers=exact_workers)
+    header = {
+        "shard": shard,
+        "shards": num_shards,
+        "rows": len(lines),
+        "circuits": len(circuits),
+        "key": shard_key(logical_rams_path, logic_block_count_path, arch, max_series, objective,
+                         exact_budget),
+    }
+    write_shard_file(output_path, header, lines)
+    return header
+
+
+def _parse_shard_spec(text: str) -> Tuple[int, int]:
+    try:
+        shard, num_shards = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected K/N (e.g. 0/4), got '{text}'")
+    return shard, num_shards
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Map the input in per-circuit shards.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="map all shards in a local process pool and merge")
+    run.add_argument("--shards", type=int, help="number of shards (default: one per worker)")
+    run.add_argument("-j", "--workers", type=int, default=0,
+                     help="worker processes (0 = one per CPU core, default)")
+    one = sub.add_parser("map", help="map one shard into a shard file")
+    one.add_argument("--shard", type=_parse_shard_spec, required=True, metavar="K/N",
+                     help="shard index K (0-based) of N")
+    merge = sub.add_parser("merge", help="merge shard files into one mapping")
+    merge.add_argument("shard_files", nargs="+")
+    merge.add_argument("-o", "--output", help="mapping file (default: stdout)")
+    for p in (run, one):
+        p.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+        p.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+        p.add_argument("--arch", help="architecture JSON spec (default: Stratix-IV-like architecture)")
+        p.add_argument("--engine", choices=ENGINES, default="python")
+        p.add_argument("--objective", choices=OBJECTIVES, default="waste")
+        p.add_argument("--max-series", type=int, default=16)
+        p.add_argument("--exact-budget", type=float, default=DEFAULT_EXACT_BUDGET,
+                       metavar="SECONDS",
+                       help=f"--objective exact: seconds of search per circuit "
+                            f"(default {DEFAULT_EXACT_BUDGET})")
+        p.add_argument("--exact-workers", type=int, default=1, metavar="N",
+                       help="--objective exact: circuits solved in parallel per shard "
+                            "(default 1; 0 = one per CPU core)")
+        p.add_argument("--sidecar", action="store_true",
+                       help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    run.add_argument("-o", "--output", help="mapping file (default: stdout)")
+    one.add_argument("-o", "--output", required=True, help="shard file to write")
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        if args.output:
+            with open(args.output, "w", buffering=1 << 20) as out:
+                merge_shard_files(args.shard_files, out)
+        else:
+            merge_shard_files(args.shard_files, sys.stdout)
+        return
+
+    arch = load_architecture(args.arch) if args.arch else Architecture(build_default_arch())
+    if args.command == "map":
+        shard, num_shards = args.shard
+        header = map_shard_file(args.logical_rams_path, args.logic_block_count_path, arch,
+                                shard, num_shards, args.output, max_series=args.max_series,
+                                engine=args.engine, objective=args.objective,
+                                sidecar=args.sidecar, exact_budget=args.exact_budget,
+                                exact_workers=args.exact_workers or None)
+        print(f"[Shard {shard}/{num_shards}] {header['circuits']} circuits, "
+              f"{header['rows']} RAMs -> {args.output}", file=sys.stderr)
+        return
+
+    lines = run_sharded(args.logical_rams_path, args.logic_block_count_path, arch,
+                        num_shards=args.shards, workers=args.workers or None,
+                        max_series=args.max_series, engine=args.engine,
+                        objective=args.objective, sidecar=args.sidecar,
+                        exact_budget=args.exact_budget, exact_workers=args.exact_workers or None)
+    if args.output:
+        with open(args.output, "w", buffering=1 << 20) as out:
+            write_lines(lines, out)
+    else:
+        write_lines(lines, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+split_report.py
+---------------
+Depth-split analysis (report only).
+
+Workflow:
+  * Maps every logical RAM twice: the minimum-waste mapping (assign_rams_with_arch)
+    and the minimum-waste mapping whose depth may be split across physical groups of
+    different types or widths (ram_mapper_core.assign_rams_split).
+  * Compares bit waste, split RAMs, physical blocks per type, decoder / MUX overhead
+    LUTs and, with logic block counts, tiles and area (area_model.evaluate_area).
+  * The checker's mapping format cannot describe a split RAM, so no mapping file is
+    written: the areas come from this repo's area model only and show what depth
+    splitting could save, not a checked result.
+
+Usage:
+    python3 split_report.py [--arch my_arch.json] [--max-series 16] [--groups 2]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from area_model import evaluate_area
+from ram_mapper_core import (MAX_SPLIT_GROUPS, Arch, Architecture, Items, SplitAssignment,
+                             assign_rams_split, assign_rams_with_arch, build_default_arch,
+                             compute_overhead_luts, item_column, load_architecture, load_inputs)
+
+
+def _summarize(label: str,
+               items: Items,
+               arch: Arch,
+               assignments: list,
+               logic_block_counts: Optional[Dict[int, int]]) -> dict:
+    overhead, decoder, mux = compute_overhead_luts(items, assignments)
+    waste_bits = 0
+    blocks: Dict[int, int] = {}
+    split_rams = fallbacks = 0
+    for choice, depth, width in zip(assignments, item_column(items, "Depth"),
+                                    item_column(items, "Width")):
+        groups = choice if isinstance(choice, SplitAssignment) else (choice,)
+        split_rams += len(groups) > 1
+        allocated = total_depth = 0
+        for type_id, phys_depth, phys_width, depth_num, width_num in (g[:5] for g in groups):
+            blocks[type_id] = blocks.get(type_id, 0) + depth_num * width_num
+            allocated += depth_num * phys_depth * width_num * phys_width
+            total_depth += depth_num * phys_depth
+            if width_num * phys_width < width:
+                total_depth = -1
+        if total_depth < depth:
+            fallbacks += 1
+        else:
+            waste_bits += allocated - depth * width
+
+    summary = {
+        "label": label,
+        "assignments": assignments,
+        "waste_bits": waste_bits,
+        "blocks": dict(sorted(blocks.items())),
+        "split_rams": split_rams,
+        "fallbacks": fallbacks,
+        "extra_luts": sum(overhead),
+        "decoder_luts": sum(decoder),
+        "mux_luts": sum(mux),
+        "total_area": None,
+        "geo_mean_area": None,
+        "tiles": None,
+    }
+    if logic_block_counts is not None:
+        report = evaluate_area(items, assignments, overhead, logic_block_counts, arch)
+        summary["total_area"] = report["total_area"]
+        summary["geo_mean_area"] = report["geo_mean_area"]
+        summary["tiles"] = sum(c["tiles"] for c in report["circuits"].values())
+    return summary
+
+
+def compare_split(items: Items,
+                  arch: Arch,
+                  logic_block_counts: Optional[Dict[int, int]] = None,
+                  max_series: int = 16,
+                  max_groups: int = MAX_SPLIT_GROUPS) -> List[dict]:
+    """
+    Maps items without and with depth splits and returns one summary dict each
+    ("waste", then "split"):
+      label: "waste" or "split".
+      assignments: Assignment (or SplitAssignment) per item.
+      waste_bits: Allocated minus used bits over all RAMs that fit.
+      blocks: type_id -> physical blocks.
+      split_rams: RAMs implemented with more than one group.
+      fallbacks: RAMs no configuration fits within max_series (fallback_choice).
+      extra_luts, decoder_luts, mux_luts: Overhead LUT totals.
+      total_area, geo_mean_area, tiles: With logic_block_counts only (else None).
+    """
+    return [
+        _summarize("waste", items, arch, assign_rams_with_arch(items, arch, max_series),
+                   logic_block_counts),
+        _summarize("split", items, arch,
+                   assign_rams_split(items, arch, max_series, max_groups=max_groups),
+                   logic_block_counts),
+    ]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Report what depth splits across RAM types "
+                                                 "would save (no mapping file is written).")
+    parser.add_argument("--arch",
+                        help="architecture JSON spec (default: Stratix-IV-like architecture)")
+    parser.add_argument("--max-series", type=int, default=16)
+    parser.add_argument("--groups", type=int, default=MAX_SPLIT_GROUPS,
+                        help=f"maximum groups per split RAM (default {MAX_SPLIT_GROUPS})")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="load the inputs from binary sidecars (<file>.cols), built on first use")
+    parser.add_argument("logical_rams_path", nargs="?", default="logical_rams.txt")
+    parser.add_argument("logic_block_count_path", nargs="?", default="logic_block_count.txt")
+    args = parser.parse_args(argv)
+    if args.groups < 1:
+        parser.error("--groups must be at least 1")
+
+    items, lb_counts = load_inputs(args.logical_rams_path, args.logic_block_count_path,
+                                   compact=True, sidecar=args.sidecar)
+    arch = load_architecture(args.arch) if args.arch else Architecture(build_default_arch())
+    start = time.perf_counter()
+    summaries = compare_split(items, arch, lb_counts, args.max_series, args.groups)
+    elapsed = time.perf_counter() - start
+
+    type_ids = [ram["type_id"] for ram in arch]
+    print(f"  {'mapping':<8} {'waste_bits':>14} {'split':>7} {'decoder':>9} {'mux':>10} "
+          + " ".join(f"{'Type' + str(t):>9}" for t in type_ids)
+          + f" {'tiles':>11} {'geo_area':>14}")
+    for s in summaries:
+        mark = f" ({s['fallbacks']} RAMs do not fit)" if s["fallbacks"] else ""
+        print(f"  {s['label']:<8} {s['waste_bits']:>14} {s['split_rams']:>7} "
+              f"{s['decoder_luts']:>9} {s['mux_luts']:>10} "
+              + " ".join(f"{s['blocks'].get(t, 0):>9}" for t in type_ids)
+              + f" {s['tiles']:>11} {s['geo_mean_area']:>14.6g}{mark}")
+    base, split = summaries
+    print(f"[Split] {elapsed:.2f}s; geometric average area {base['geo_mean_area']:.6g} -> "
+          f"{split['geo_mean_area']:.6g} (area model only; the checker cannot read split "
+          f"mappings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sweep_checkpoint.py
+-------------------
+ECE1756 Assignment 3 - Resumable Sweep Checkpoints
+
+Description:
+  * A checkpoint is a JSON-lines journal: a header line describing the sweep (kind,
+    input digests, max_series, objective) followed by one record per completed point
+    (mapping file name and size, area report lines, per-circuit rows, totals).
+  * Each record is appended with a single write and fsync'd by the process that
+    finished the point, as soon as its mapping file is in place, so points that
+    complete out of order in parallel workers are never lost.
+  * On restart, points with a record (and an intact mapping file) are skipped; points
+    that were in flight when the sweep died have no record and are mapped again. A
+    torn last line is cut off; a journal of a different sweep or different inputs is
+    started over.
+
+Usage:
+    python3 run_with_lutram_sweep.py -j 4 --checkpoint lutram.ckpt   (rerun to resume)
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+from result_cache import file_digest
+
+FORMAT_VERSION = 1
+
+
+def checkpoint_header(kind: str,
+                      logical_rams_path: str,
+                      logic_block_count_path: str,
+                      max_series: int,
+                      objective: str,
+                      exact_budget: Optional[float] = None) -> dict:
+    """
+    Describes a sweep; records are only reused under an identical header.
+    """
+    header = {
+        "checkpoint": FORMAT_VERSION,
+        "kind": kind,
+        "inputs": [file_digest(logical_rams_path), file_digest(logic_block_count_path)],
+        "max_series": max_series,
+        "objective": objective,
+    }
+    if exact_budget is not None:
+        header["exact_budget"] = exact_budget
+    return header
+
+
+def _write_header(path: str, header: dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(header) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def open_checkpoint(path: str, header: dict) -> Dict[tuple, dict]:
+    """
+    Prepares the journal at path for appending and returns its completed points
+    ((size_bits, max_width, lb_per_bram) -> record). Creates the journal if it is
+    missing and starts it over if its header differs from header.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b""
+
+    # Drop a line torn by a kill mid-append, so new records start on a fresh line
+    complete = data[:data.rfind(b"\n") + 1]
+    lines = complete.splitlines()
+    try:
+        same = bool(lines) and json.loads(lines[0]) == header
+    except ValueError:
+        same = False
+    if not same:
+        _write_header(path, header)
+        return {}
+    if len(complete) < len(data):
+        with open(path, "r+b") as f:
+            f.truncate(len(complete))
+            os.fsync(f.fileno())
+
+    records: Dict[tuple, dict] = {}
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+            point = tuple(record["point"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        records[point] = record
+    return records
+
+
+def append_record(path: str, record: dict) -> None:
+    """
+    Appends one record as a single O_APPEND write and fsyncs it (safe to call from
+    several worker processes at once).
+    """
+    line = (json.dumps(record) + "\n").encode()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def is_intact(record: dict) -> bool:
+    """
+    True if the mapping file of a record still exists with the recorded size.
+    """
+    try:
+        return os.path.getsize(record["out_name"]) == record["mapping_bytes"]
+    except OSError:
+        return False
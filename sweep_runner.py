@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sweep_runner.py
+---------------
+ECE1756 Assignment 3 - Parallel BRAM Sweep Runner
+
+Description:
+  * Distributes (size_bits, max_width, lb_per_bram) sweep points across a process pool.
+  * Each worker parses the benchmark files once and keeps its own IncrementalMapper,
+    so consecutive points only remap the RAM types that changed (none when only
+    lb_per_bram differs).
+  * Area is evaluated in-process (area_model.py); the external ./checker is only
+    run when requested, as a cross-check, once all points are mapped: the checker
+    runs are launched concurrently (checker_runner.py) with a limit and a timeout.
+  * With a cache directory, mapping lines and area results are stored on disk
+    (result_cache.py) and unchanged points are served from it on later runs.
+  * With a database path, every point (architecture, per-circuit resources, overhead
+    LUTs and area) is recorded in SQLite at the end of the sweep (results_store.py).
+  * With a checkpoint path, every completed point is journaled as soon as it finishes
+    (sweep_checkpoint.py); rerunning the sweep skips the journaled points.
+  * Results are reported in candidate order regardless of completion order,
+    then collected into one summary table.
+  * Used by run_no_lutram_sweep.py (part e) and run_with_lutram_sweep.py (part f).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from area_model import checker_command, evaluate_area, format_area_report
+from checker_runner import run_checkers
+from ram_mapper_core import (DEFAULT_EXACT_BUDGET, Architecture, IncrementalMapper,
+                             build_arch_lutram_plus_bram, build_arch_one_bram, load_inputs,
+                             run_mapper_batch)
+from result_cache import DEFAULT_MAX_BYTES, ResultCache, file_digest, result_key
+from results_store import ResultsStore, circuit_rows
+from sweep_checkpoint import append_record, checkpoint_header, is_intact, open_checkpoint
+
+# (size_bits, max_width, lb_per_bram)
+SweepPoint = Tuple[int, int, int]
+
+# Sweep kind -> (report label, mapping file prefix, architecture builder)
+SWEEP_KINDS: Dict[str, tuple] = {
+    "no_lutram": ("No LUTRAM", "mapping_noLUT", build_arch_one_bram),
+    "with_lutram": ("With LUTRAM", "mapping_LUT+BRAM", build_arch_lutram_plus_bram),
+}
+
+# Per-process state, filled by _init_worker
+_WORKER: dict = {}
+
+
+def _init_worker(logical_rams_path: str,
+                 logic_block_count_path: str,
+                 max_series: int,
+                 objective: str,
+                 checker: Optional[str],
+                 cache_dir: Optional[str] = None,
+                 cache_bytes: int = DEFAULT_MAX_BYTES,
+                 sidecar: bool = False,
+                 checkpoint: Optional[str] = None,
+                 exact_budget: Optional[float] = None,
+                 exact_workers: Optional[int] = None) -> None:
+    """
+    Parses the benchmark once per worker process (or maps the shared sidecars).
+    """
+    items, lb_counts = load_inputs(logical_rams_path, logic_block_count_path, compact=True,
+                                   sidecar=sidecar)
+    if cache_dir:
+        _WORKER["results"] = ResultCache(cache_dir, cache_bytes)
+        _WORKER["digests"] = [file_digest(logical_rams_path), file_digest(logic_block_count_path)]
+    else:
+        _WORKER["results"] = None
+    _WORKER.update({
+        "items": items,
+        "lb_counts": lb_counts,
+        "mapper": IncrementalMapper(items),
+        "logical_rams": logical_rams_path,
+        "logic_blocks": logic_block_count_path,
+        "max_series": max_series,
+        "objective": objective,
+        "checker": checker,
+        "checkpoint": checkpoint,
+        "exact_budget": exact_budget,
+        "exact_workers": exact_workers,
+    })
+
+
+def _run_point(kind: str, point: SweepPoint) -> dict:
+    """
+    Maps one sweep point, writes its mapping file and evaluates its area
+    (and builds its checker command when a checker is configured).
+    """
+    label, prefix, builder = SWEEP_KINDS[kind]
+    size_bits, max_width, lb_per_bram = point
+    mapper = _WORKER["mapper"]
+    tables, remaps = mapper.tables_built, mapper.remaps
+    start = time.perf_counter()
+
+    # 1. Construct architecture; look it up in the on-disk result cache
+    arch = Architecture(builder(size_bits, max_width, lb_per_bram))
+    results = _WORKER["results"]
+    key = entry = None
+    if results is not None:
+        key = result_key(_WORKER["digests"], arch, _WORKER["max_series"], _WORKER["objective"],
+                         _WORKER["exact_budget"])
+        entry = results.get(key)
+
+    if entry is None:
+        # 2. Map it and evaluate area in-process
+        items = _WORKER["items"]
+        result = run_mapper_batch(items, [arch], max_series=_WORKER["max_series"],
+                                  objective=_WORKER["objective"],
+                                  logic_block_counts=_WORKER["lb_counts"], mapper=mapper,
+                                  exact_budget=_WORKER["exact_budget"],
+                                  exact_workers=_WORKER["exact_workers"])[0]
+        report = evaluate_area(items, result["assignments"], result["overhead_luts"],
+                               _WORKER["lb_counts"], arch)
+        entry = {
+            "lines": result["lines"],
+            "report_lines": format_area_report(report, arch),
+            "circuits": circuit_rows(report),
+            "total_area": report["total_area"],
+            "geo_mean_area": report["geo_mean_area"],
+        }
+        if results is not None:
+            results.put(key, entry)
+        cached = False
+    else:
+        cached = True
+
+    # 3. Write mapping to file (atomically: a killed sweep leaves no partial mapping)
+    out_name = f"{prefix}_{size_bits}b_W{max_width}_R{lb_per_bram}.txt"
+    tmp_name = f"{out_name}.{os.getpid()}.tmp"
+    with open(tmp_name, "w") as f:
+        for line in entry["lines"]:
+            f.write(line + "\n")
+        if _WORKER["checkpoint"]:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_name, out_name)
+
+    point_result = {
+        "label": label,
+        "point": point,
+        "arch": arch,
+        "out_name": out_name,
+        "report_lines": entry["report_lines"],
+        "circuits": entry["circuits"],
+        "total_area": entry["total_area"],
+        "geo_mean_area": entry["geo_mean_area"],
+        "cmd": None,
+        "checker_geo_mean_area": None,
+        "tables_built": mapper.tables_built - tables,
+        "remapped": mapper.remaps > remaps,
+        "result_cached": cached,
+        "resumed": False,
+    }
+
+    # 4. Checker command for the optional cross-check (run later by run_sweep)
+    if _WORKER["checker"]:
+        point_result["cmd"] = checker_command(arch, _WORKER["logical_rams"],
+                                              _WORKER["logic_blocks"], out_name,
+                                              checker=_WORKER["checker"])
+
+    point_result["elapsed"] = time.perf_counter() - start
+
+    # 5. Journal the completed point (the mapping file is already in place)
+    if _WORKER["checkpoint"]:
+        append_record(_WORKER["checkpoint"], {
+            "point": list(point),
+            "out_name": out_name,
+            "mapping_bytes": os.path.getsize(out_name),
+            "report_lines": entry["report_lines"],
+            "circuits": entry["circuits"],
+            "total_area": entry["total_area"],
+            "geo_mean_area": entry["geo_mean_area"],
+            "elapsed": point_result["elapsed"],
+        })
+    return point_result
+
+
+def _resumed_point(kind: str,
+                   record: dict,
+                   checker: Optional[str],
+                   logical_rams_path: str,
+                   logic_block_count_path: str) -> dict:
+    """
+    Rebuilds the result dict of a point completed by an earlier run from its checkpoint record.
+    """
+    label, _, builder = SWEEP_KINDS[kind]
+    point = tuple(record["point"])
+    arch = Architecture(builder(*point))
+    cmd = None
+    if checker:
+        cmd = checker_command(arch, logical_rams_path, logic_block_count_path,
+                              record["out_name"], checker=checker)
+    return {
+        "label": label,
+        "point": point,
+        "arch": arch,
+        "out_name": record["out_name"],
+        "report_lines": record["report_lines"],
+        "circuits": record["circuits"],
+        "total_area": record["total_area"],
+        "geo_mean_area": record["geo_mean_area"],
+        "cmd": cmd,
+        "checker_geo_mean_area": None,
+        "tables_built": 0,
+        "remapped": False,
+        "result_cached": False,
+        "resumed": True,
+        "elapsed": record["elapsed"],
+    }
+
+
+def print_point(result: dict) -> None:
+    """
+    Prints one sweep point in the per-candidate report format of the sweep scripts.
+    """
+    size_bits, max_width, lb_per_bram = result["point"]
+    print("=" * 80)
+    print(f"[{result['label']}] size={size_bits} bits, max_width={max_width}, "
+          f"LBs/BRAM={lb_per_bram}")
+    if result["resumed"]:
+        print(f"  -> mapping in {result['out_name']} (from checkpoint)")
+    else:
+        print(f"  -> mapping written to {result['out_name']}"
+              + (" (from result cache)" if result["result_cached"] else ""))
+    for line in result["report_lines"]:
+        print(line)
+    if result["cmd"] is not None:
+        print("  -> Running command:", " ".join(result["cmd"]))
+        print(result["stdout"])
+        if result["stderr"]:
+            print("[checker stderr]")
+            print(result["stderr"])
+        if result["checker_status"] != "ok":
+            print(f"  -> checker {result['checker_status'].upper()} "
+                  f"after {result['checker_attempts']} attempt(s)")
+
+
+def print_summary(results: List[dict]) -> None:
+    """
+    Prints one line per sweep point plus aggregated mapper and cache statistics.
+    """
+    print("=" * 80)
+    print("[Sweep summary]")
+    print(f"  {'size_bits':>10} {'max_width':>9} {'LBs/BRAM':>8} {'geo_area':>14} "
+          f"{'checker_area':>14} {'time(s)':>8}")
+    for result in results:
+        size_bits, max_width, lb_per_bram = result["point"]
+        checker_area = result["checker_geo_mean_area"]
+        if result["cmd"] is not None and result["checker_status"] != "ok":
+            checker_str = result["checker_status"].upper()
+        else:
+            checker_str = f"{checker_area:.6g}" if checker_area is not None else "-"
+        print(f"  {size_bits:>10} {max_width:>9} {lb_per_bram:>8} "
+              f"{result['geo_mean_area']:>14.6g} {checker_str:>14} {result['elapsed']:>8.2f}")
+
+    tables = sum(r["tables_built"] for r in results)
+    remapped = sum(1 for r in results if r["remapped"])
+    print(f"[Incremental mapper] {remapped} of {len(results)} points remapped, "
+          f"{tables} RAM type tables built")
+    cached = sum(1 for r in results if r["result_cached"])
+    print(f"[Result cache] {cached} of {len(results)} points served from disk")
+    resumed = sum(1 for r in results if r["resumed"])
+    print(f"[Checkpoint] {resumed} of {len(results)} points resumed")
+
+
+def run_sweep(kind: str,
+              candidates: List[SweepPoint],
+              logical_rams_path: str = "logical_rams.txt",
+              logic_block_count_path: str = "logic_block_count.txt",
+              workers: Optional[int] = 1,
+              max_series: int = 16,
+              objective: str = "waste",
+              use_checker: bool = False,
+              cache_dir: Optional[str] = None,
+              cache_bytes: int = DEFAULT_MAX_BYTES,
+              checker: str = "./checker",
+              checker_jobs: int = 4,
+              checker_timeout: Optional[float] = 300.0,
+              checker_retries: int = 1,
+              db_path: Optional[str] = None,
+              sidecar: bool = False,
+              checkpoint_path: Optional[str] = None,
+              exact_budget: Optional[float] = None,
+              exact_workers: Optional[int] = None,
+              verbose: bool = True) -> List[dict]:
+    """
+    Runs a BRAM sweep, one task per candidate point.
+
+    Parameters:
+      kind: Key of SWEEP_KINDS ("no_lutram" or "with_lutram").
+      candidates: (size_bits, max_width, lb_per_bram) points.
+      workers: Number of worker processes (None = os.cpu_count(); 1 = run in-process).
+      objective: Mapping objective passed to run_mapper_batch: "waste" (per-RAM minimum
+                 waste), "area" (refined for circuit tiles) or "exact" (per-circuit
+                 branch-and-bound).
+      use_checker: Also run the checker on every mapping file as a cross-check.
+      cache_dir: Directory of the on-disk result cache (None = disabled); may be
+                 shared by concurrent sweeps.
+      cache_bytes: Size bound of the result cache; older entries are evicted.
+      checker: Checker executable (e.g. ./fake_checker.py for local runs).
+      checker_jobs: Maximum number of checker processes running at once.
+      checker_timeout: Seconds before a checker run is killed (None = no limit).
+      checker_retries: Extra attempts for a failed or timed-out checker run; runs
+                       that still fail are flagged in checker_status.
+      db_path: SQLite results database to record every point in (None = off).
+      sidecar: Load the inputs from memory-mapped binary sidecars, so that workers
+               share one copy of the input columns (see input_sidecar.py).
+      checkpoint_path: Journal of completed points (None = off). Points already in it,
+                       from an interrupted run of the same sweep on the same inputs,
+                       are not mapped again (see sweep_checkpoint.py).
+      exact_budget: Objective "exact": seconds of search per circuit (None =
+                    DEFAULT_EXACT_BUDGET).
+      exact_workers: Objective "exact": processes solving a point's circuits in
+                     parallel (None = the CPU cores divided among the sweep workers).
+      verbose: Print each point (in candidate order) and the final summary.
+
+    Returns the per-point result dicts in candidate order.
+    """
+    if kind not in SWEEP_KINDS:
+        raise ValueError(f"Unknown sweep kind '{kind}', expected one of {list(SWEEP_KINDS)}")
+    checker_bin = checker if use_checker else None
+    if objective == "exact":
+        # Part of the cache key and checkpoint header: a longer search may map differently
+        exact_budget = DEFAULT_EXACT_BUDGET if exact_budget is None else exact_budget
+    else:
+        exact_budget = None
+    done: Dict[SweepPoint, dict] = {}
+    if checkpoint_path:
+        header = checkpoint_header(kind, logical_rams_path, logic_block_count_path,
+                                   max_series, objective, exact_budget)
+        records = open_checkpoint(checkpoint_path, header)
+        done = {point: record for point, record in records.items() if is_intact(record)}
+    pending = [point for point in candidates if tuple(point) not in done]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending) or 1))
+    if exact_workers is None:
+        exact_workers = max(1, (os.cpu_count() or 1) // workers)
+
+    init_args = (logical_rams_path, logic_block_count_path, max_series, objective,
+                 checker_bin, cache_dir, cache_bytes, sidecar, checkpoint_path,
+                 exact_budget, exact_workers)
+    results: List[dict] = []
+    # With a checker, points are printed once its results are in
+    print_now = verbose and not use_checker
+
+    def collect(fresh) -> None:
+        # Interleaves resumed points with the fresh results, in candidate order
+        for point in candidates:
+            if tuple(point) in done:
+                result = _resumed_point(kind, done[tuple(point)], checker_bin,
+                                        logical_rams_path, logic_block_count_path)
+            else:
+                result = next(fresh)
+            if print_now:
+                print_point(result)
+            results.append(result)
+
+    if not pending:
+        collect(iter(()))
+    elif workers == 1:
+        _init_worker(*init_args)
+        collect(_run_point(kind, point) for point in pending)
+    else:
+        if sidecar:
+            # Build or refresh the sidecars once, before the workers map them
+            load_inputs(logical_rams_path, logic_block_count_path, sidecar=True)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            # Executor.map yields in submission order, keeping output deterministic;
+            # contiguous chunks let each worker's IncrementalMapper reuse neighbours.
+            # Workers journal each point when it completes, whatever the yield order.
+            chunksize = max(1, len(pending) // (workers * 2))
+            collect(pool.map(_run_point, [kind] * len(pending), pending, chunksize=chunksize))
+
+    if use_checker:
+        records = run_checkers([r["cmd"] for r in results], concurrency=checker_jobs,
+                               timeout=checker_timeout, retries=checker_retries)
+        for result, record in zip(results, records):
+            result.update({
+                "stdout": record["stdout"],
+                "stderr": record["stderr"],
+                "returncode": record["returncode"],
+                "checker_status": record["status"],
+                "checker_attempts": record["attempts"],
+                "checker_circuits": record["circuits"],
+                "checker_geo_mean_area": record["geo_mean_area"],
+            })
+            if verbose:
+                print_point(result)
+
+    if db_path:
+        # Resumed points are recorded too: an interrupted sweep never reached this
+        # step, and add_runs replaces points a finished run already recorded
+        inputs = file_digest(logical_rams_path)
+        with ResultsStore(db_path) as store:
+            store.add_runs({"kind": kind, "label": r["label"], "point": r["point"],
+                            "arch": r["arch"], "max_series": max_series, "objective": objective,
+                            "inputs": inputs, "circuits": r["circuits"],
+                            "total_area": r["total_area"], "geo_mean_area": r["geo_mean_area"]}
+                           for r in results)
+
+    if verbose:
+        print_summary(results)
+    return results